@@ -9,9 +9,18 @@ from psycopg2 import pool
 from botocore.exceptions import ClientError, NoCredentialsError
 import importlib
 import sys
+import threading
 import zipfile
 import io
 
+
+def dumps_json(value):
+    """
+    JSON text for a VARCHAR column. Profile and frontend filters match substrings of the stored text
+    with position(... in tags), so it keeps the json.dumps separators and str() for datetimes
+    """
+    return json.dumps(value, default=str)
+
    
 ######################################################
 ######################################################
@@ -105,9 +114,9 @@ class DataStore:
                         tag['resource_id'], 
                         tag['name'],                                                 
                         self.timestamp_to_string(tag['creation_date']),                        
-                        json.dumps(tag['tags']),
+                        dumps_json(tag['tags']),
                         tag['tags_number'],
-                        json.dumps(tag['metadata'],default=str),
+                        dumps_json(tag['metadata']),
                         tag['arn'],
                     ) for tag in batch
                 ]
@@ -282,6 +291,8 @@ class AWSResourceDiscovery:
         self.metadata_path =  '/tmp/metadata'
         self.service_catalog = {}
         self.region_catalog = []
+        self.module_cache = {}
+        self.module_lock = threading.Lock()
 
         # Configure logging
         logging.basicConfig(
@@ -316,6 +327,21 @@ class AWSResourceDiscovery:
 
 
 
+    ###
+    ###-- Load service module (once per scan, so module level caches are shared across service types)
+    ###
+
+    def get_module(self, module_name):
+        with self.module_lock:
+            if module_name not in self.module_cache:
+                spec = importlib.util.spec_from_file_location(module_name, f'{self.script_path}/{module_name}.py')
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                self.module_cache[module_name] = module
+            return self.module_cache[module_name]
+
+
+
     ###
     ###-- Collect resource tags
     ###
@@ -324,9 +350,7 @@ class AWSResourceDiscovery:
         try:
             module_name, service_type = service.split('::')    
             module_name = module_name.lower()        
-            spec = importlib.util.spec_from_file_location(module_name, f'{self.script_path}/{module_name}.py')
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)            
+            module = self.get_module(module_name)
             
             return module.discovery(self, session, account_id, region, module_name, service_type, self.logger)                      
 
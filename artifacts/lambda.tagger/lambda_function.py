@@ -8,12 +8,14 @@ import logging
 from collections import defaultdict
 from dataclasses import dataclass
 from botocore.exceptions import ClientError
+from botocore.config import Config
 import psycopg2
 from psycopg2 import pool
 import importlib
 from collections import Counter
 import zipfile
 import io
+import threading
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -159,6 +161,8 @@ class AWSResourceTagger:
         )
         self.role_name = role_name
         self.script_path =  '/tmp/scripts'
+        self.module_cache = {}
+        self.module_lock = threading.Lock()
 
         # Configure logging
         logging.basicConfig(
@@ -204,8 +208,10 @@ class AWSResourceTagger:
     def get_client(self, account_id: str, region: str, service: str) -> boto3.client:        
         if service not in self.client_cache[account_id][region]:
             session = self.get_session(account_id, role_name=self.role_name)
+            # Adaptive retries absorb throttling from concurrent tag calls inside the modules
             self.client_cache[account_id][region][service] = session.client(
-                service, region_name=region
+                service, region_name=region,
+                config=Config(retries={'max_attempts': 10, 'mode': 'adaptive'}, max_pool_connections=32)
             )
         return self.client_cache[account_id][region][service]
 
@@ -241,6 +247,21 @@ class AWSResourceTagger:
 
 
 
+    ###
+    ###-- Load service module (once per service, so module level clients are reused across batches)
+    ###
+
+    def get_module(self, service: str):
+        with self.module_lock:
+            if service not in self.module_cache:
+                spec = importlib.util.spec_from_file_location(service, f'{self.script_path}/{service}.py')
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                self.module_cache[service] = module
+            return self.module_cache[service]
+
+
+
     ###
     ###-- Perfom batch tagging process
     ###
@@ -253,9 +274,7 @@ class AWSResourceTagger:
         try:
 
             # Import module            
-            spec = importlib.util.spec_from_file_location(service, f'{self.script_path}/{service}.py')
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)                      
+            module = self.get_module(service)
             
             results = module.tagging(account_id, region, service, client, resources, tags, action, self.logger )
                       
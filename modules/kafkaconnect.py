@@ -1,10 +1,46 @@
 import json
 import boto3
 import time
+import threading
+from functools import lru_cache
 from typing import List, Dict, Tuple
 from botocore.exceptions import OperationNotPageableError, ClientError, ConnectTimeoutError, ReadTimeoutError
 from botocore.config import Config
 
+
+def _get_supported_regions():
+    """
+    Regions where MSK Connect is offered, across all partitions known to botocore
+    """
+    session = boto3.Session()
+    regions = set()
+    for partition in session.get_available_partitions():
+        regions.update(session.get_available_regions('kafkaconnect', partition_name=partition))
+    return regions
+
+
+_KAFKACONNECT_REGIONS = _get_supported_regions()
+
+_CLIENT_CONFIG = Config(
+    read_timeout=15,
+    connect_timeout=10,
+    retries={'max_attempts': 3, 'mode': 'standard'}
+)
+
+_DEFAULT_SESSION = boto3.Session()
+_CLIENT_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=64)
+def _get_client(region):
+    """
+    Kafka Connect client for the default session, cached per region (boto3 clients are thread-safe,
+    sessions are not, so creation is serialized)
+    """
+    with _CLIENT_LOCK:
+        return _DEFAULT_SESSION.client('kafkaconnect', region_name=region, config=_CLIENT_CONFIG)
+
+
 def get_service_types(account_id, region, service, service_type):
     """
     Amazon MSK Connect (Kafka Connect) resources that support tagging.
@@ -89,16 +125,14 @@ def discovery(self, session, account_id, region, service, service_type, logger):
             raise ValueError(f"Unsupported service type: {service_type}")
 
         config = service_types_list[service_type]
-        
-        # Configure client with timeouts
-        client_config = Config(
-            read_timeout=15,
-            connect_timeout=10,
-            retries={'max_attempts': 3, 'mode': 'standard'}
-        )
+
+        # Skip regions where MSK Connect is not offered (empty set means endpoint data is unavailable)
+        if _KAFKACONNECT_REGIONS and region not in _KAFKACONNECT_REGIONS:
+            logger.info(f"Kafka Connect not available in region {region}, skipping")
+            return f'{service}:{service_type}', "success", "", []
         
         try:
-            client = session.client('kafkaconnect', region_name=region, config=client_config)
+            client = session.client('kafkaconnect', region_name=region, config=_CLIENT_CONFIG)
         except Exception as e:
             logger.warning(f"Kafka Connect client creation failed in region {region}: {str(e)}")
             return f'{service}:{service_type}', "success", "", []
@@ -260,44 +294,47 @@ def discovery(self, session, account_id, region, service, service_type, logger):
     return f'{service}:{service_type}', status, error_message, resources
 
 
-def tagging(account_id, region, service, client, resources, tags_string, tags_action, logger):
+def tagging(account_id, region, service, client, resources, tags_string, tags_action, logger, session=None):
     logger.info(f'Tagging # Account : {account_id}, Region : {region}, Service : {service}')
     
     results = []    
+
+    if tags_action not in (1, 2):
+        logger.error(f"Invalid tags action {tags_action} for {service} in {account_id}/{region}, expected 1 (add) or 2 (remove)")
+        return []
+
     tags = parse_tags(tags_string)
 
-    # Create Kafka Connect client with timeout protection
-    session = boto3.Session()
-    client_config = Config(
-        read_timeout=15,
-        connect_timeout=10,
-        retries={'max_attempts': 3, 'mode': 'standard'}
-    )
-    
+    # Reuse the cached Kafka Connect client unless an explicit session is given
     try:
-        kafkaconnect_client = session.client('kafkaconnect', region_name=region, config=client_config)
+        if session is None:
+            kafkaconnect_client = _get_client(region)
+        else:
+            kafkaconnect_client = session.client('kafkaconnect', region_name=region, config=_CLIENT_CONFIG)
     except Exception as e:
         logger.error(f"Failed to create Kafka Connect client: {str(e)}")
         return []
 
+    def add_tags(arn):
+        # Convert tags to Kafka Connect format (dictionary)
+        tags_dict = {tag['Key']: tag['Value'] for tag in tags}
+        kafkaconnect_client.tag_resource(
+            resourceArn=arn,
+            tags=tags_dict
+        )
+
+    def remove_tags(arn):
+        kafkaconnect_client.untag_resource(
+            resourceArn=arn,
+            tagKeys=[tag['Key'] for tag in tags]
+        )
+
+    tag_operation = add_tags if tags_action == 1 else remove_tags
+
     for resource in resources:
         try:
-            def tag_resource():
-                if tags_action == 1:  # Add tags
-                    # Convert tags to Kafka Connect format (dictionary)
-                    tags_dict = {tag['Key']: tag['Value'] for tag in tags}
-                    kafkaconnect_client.tag_resource(
-                        resourceArn=resource.arn,
-                        tags=tags_dict
-                    )
-                elif tags_action == 2:  # Remove tags
-                    kafkaconnect_client.untag_resource(
-                        resourceArn=resource.arn,
-                        tagKeys=[tag['Key'] for tag in tags]
-                    )
-            
             # Use retry logic for tagging operations
-            retry_with_backoff(tag_resource, max_retries=3)
+            retry_with_backoff(lambda: tag_operation(resource.arn), max_retries=3)
                 
             results.append({
                 'account_id': account_id,
@@ -1,10 +1,211 @@
 import json
+import os
+import pickle
 import boto3
+import botocore
+import botocore.session
+from botocore import xform_name
 import time
-from typing import List, Dict, Tuple
-from botocore.exceptions import OperationNotPageableError, ClientError, ConnectTimeoutError, ReadTimeoutError
+import random
+import threading
+import weakref
+import itertools
+import concurrent.futures
+from operator import itemgetter
+from typing import List, Dict, Tuple, Any, Optional
+from dataclasses import dataclass
+from botocore.exceptions import OperationNotPageableError, ClientError, BotoCoreError, ConnectTimeoutError, ReadTimeoutError
 from botocore.config import Config
 
+
+# Concurrency for per-index listing and per-resource tag lookups
+MAX_WORKERS = 16
+MAX_CONCURRENT_CALLS = 16
+
+# Shared across discovery invocations so parallel scans don't multiply the Kendra request rate
+_API_SEMAPHORE = threading.Semaphore(MAX_CONCURRENT_CALLS)
+
+THROTTLING_ERROR_CODES = (
+    'TooManyRequestsException',
+    'Throttling',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'ProvisionedThroughputExceededException'
+)
+
+# Shared client configuration, the pool covers several discoveries fanning out on the same client.
+# botocore retries every error kind alike, including the EndpointConnectionError of regions without
+# Kendra, so attempts stay low and throttling gets its extra attempts from retry_with_backoff
+CLIENT_CONFIG = Config(
+    read_timeout=15,
+    connect_timeout=10,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    max_pool_connections=50
+)
+
+# Kendra clients per session and region, entries go away with their session
+_DEFAULT_SESSION = boto3.Session()
+_CLIENT_CACHE = weakref.WeakKeyDictionary()
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+# Index ids per (account_id, region) as (time, index ids, error), shared by every index-scoped resource type
+INDEX_CACHE_TTL = 300
+_INDEX_CACHE = {}
+_INDEX_CACHE_LOCK = threading.Lock()
+# Per-key [lock, users] for in-flight sweeps, an entry is dropped with its last user
+_INDEX_FETCH_LOCKS = {}
+
+# On-disk cache of discovery results, disabled unless MYTAGGER_CACHE_TTL (seconds) is set
+DISCOVERY_CACHE_TTL = int(os.environ.get('MYTAGGER_CACHE_TTL', '0'))
+DISCOVERY_CACHE_PATH = os.environ.get('MYTAGGER_CACHE_PATH', '/tmp/cache')
+
+
+# Kendra Tag objects always carry both Key and Value
+_TAG_KEY_VALUE = itemgetter('Key', 'Value')
+
+# Defaults for metadata fields missing from a list response, anything not listed defaults to ''
+METADATA_DEFAULTS = {'ItemCount': 0, 'Endpoints': []}
+
+# Static resource definitions, built once at import time and treated as read-only
+_RESOURCE_CONFIGS = {
+    'Index': {
+        'method': 'list_indices',
+        'key': 'IndexConfigurationSummaryItems',
+        'id_field': 'Id',
+        'name_field': 'Name',
+        'date_field': 'CreatedAt',
+        'nested': False,
+        'arn_path': None,  # ARN is the index prefix plus the index id
+        'metadata_fields': ('Status', 'Edition', 'UpdatedAt', 'Description')
+    },
+    'DataSource': {
+        'method': 'list_data_sources',
+        'key': 'SummaryItems',
+        'id_field': 'Id',
+        'name_field': 'Name',
+        'date_field': 'CreatedAt',
+        'nested': False,
+        'arn_path': '/data-source/',
+        'requires_index': True,
+        'metadata_fields': ('Type', 'Status', 'UpdatedAt', 'LanguageCode')
+    },
+    'FAQ': {
+        'method': 'list_faqs',
+        'key': 'FaqSummaryItems',
+        'id_field': 'Id',
+        'name_field': 'Name',
+        'date_field': 'CreatedAt',
+        'nested': False,
+        'arn_path': '/faq/',
+        'requires_index': True,
+        'metadata_fields': ('Status', 'UpdatedAt', 'FileFormat', 'LanguageCode')
+    },
+    'Thesaurus': {
+        'method': 'list_thesauri',
+        'key': 'ThesaurusSummaryItems',
+        'id_field': 'Id',
+        'name_field': 'Name',
+        'date_field': 'CreatedAt',
+        'nested': False,
+        'arn_path': '/thesaurus/',
+        'requires_index': True,
+        'metadata_fields': ('Status', 'UpdatedAt', 'Description')
+    },
+    'Experience': {
+        'method': 'list_experiences',
+        'key': 'SummaryItems',
+        'id_field': 'Id',
+        'name_field': 'Name',
+        'date_field': 'CreatedAt',
+        'nested': False,
+        'arn_path': '/experience/',
+        'requires_index': True,
+        'metadata_fields': ('Status', 'UpdatedAt', 'Endpoints')
+    },
+    'QuerySuggestionsBlockList': {
+        'method': 'list_query_suggestions_block_lists',
+        'key': 'BlockListSummaryItems',
+        'id_field': 'Id',
+        'name_field': 'Name',
+        'date_field': 'CreatedAt',
+        'nested': False,
+        'arn_path': '/query-suggestions-block-list/',
+        'requires_index': True,
+        'metadata_fields': ('Status', 'UpdatedAt', 'ItemCount', 'Description')
+    },
+    'FeaturedResultsSet': {
+        'method': 'list_featured_results_sets',
+        'key': 'FeaturedResultsSetSummaryItems',
+        'id_field': 'FeaturedResultsSetId',
+        'name_field': 'FeaturedResultsSetName',
+        'date_field': 'CreationTimestamp',
+        'nested': False,
+        'arn_path': '/featured-results-set/',
+        'requires_index': True,
+        'metadata_fields': ('Status', 'LastUpdatedTimestamp', 'Description')
+    },
+    'AccessControlConfiguration': {
+        'method': 'list_access_control_configurations',
+        'key': 'AccessControlConfigurations',
+        'id_field': 'Id',
+        'name_field': 'Name',
+        'date_field': None,
+        'nested': False,
+        'arn_path': '/access-control-configuration/',
+        'requires_index': True,
+        'metadata_fields': ('Description',)
+    }
+}
+
+
+@dataclass(slots=True)
+class KendraResource:
+    account_id: str
+    region: str
+    service: str
+    resource_type: str
+    resource_id: str
+    name: str
+    creation_date: Optional[str]
+    tags: Dict[str, str]
+    tags_number: int
+    metadata: Dict[str, Any]
+    arn: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Discovery lambda stores records by key and adds its own fields (seq)
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+def validate_resource_configs():
+    """
+    Fail at import time if a configured list method is not a Kendra operation in the installed botocore
+    """
+    service_model = botocore.session.get_session().get_service_model('kendra')
+    methods = {xform_name(operation) for operation in service_model.operation_names}
+    stale = [f"{service_type}:{config['method']}" for service_type, config in _RESOURCE_CONFIGS.items() if config['method'] not in methods]
+    if stale:
+        raise ImportError(f"Kendra operations not available in botocore {botocore.__version__}: {', '.join(stale)}")
+
+
+validate_resource_configs()
+
+
+# Per service type, the config fields the item loop needs, resolved once so the loop does no config lookups:
+# (id_field, name_field, date_field, ((metadata_field, default), ...), arn_path, requires_index)
+_SERVICE_METADATA_EXTRACTOR = {
+    service_type: (
+        config['id_field'],
+        config['name_field'],
+        config['date_field'],
+        tuple((field, METADATA_DEFAULTS.get(field, '')) for field in config['metadata_fields']),
+        config['arn_path'],
+        config.get('requires_index', False)
+    )
+    for service_type, config in _RESOURCE_CONFIGS.items()
+}
+
+
 def get_service_types(account_id, region, service, service_type):
     """
     Amazon Kendra resources that support tagging.
@@ -23,381 +224,392 @@ def get_service_types(account_id, region, service, service_type):
     - AccessControlConfiguration (Access control configurations)
     """
 
-    resource_configs = {
-        'Index': {
-            'method': 'list_indices',
-            'key': 'IndexConfigurationSummaryItems',
-            'id_field': 'Id',
-            'name_field': 'Name',
-            'date_field': 'CreatedAt',
-            'nested': False,
-            'arn_format': 'arn:aws:kendra:{region}:{account_id}:index/{resource_id}',
-            'describe_method': 'describe_index',
-            'describe_param': 'Id'
-        },
-        'DataSource': {
-            'method': 'list_data_sources',
-            'key': 'SummaryItems',
-            'id_field': 'Id',
-            'name_field': 'Name',
-            'date_field': 'CreatedAt',
-            'nested': False,
-            'arn_format': 'arn:aws:kendra:{region}:{account_id}:index/{index_id}/data-source/{resource_id}',
-            'describe_method': 'describe_data_source',
-            'describe_param': 'Id',
-            'requires_index': True
-        },
-        'FAQ': {
-            'method': 'list_faqs',
-            'key': 'FaqSummaryItems',
-            'id_field': 'Id',
-            'name_field': 'Name',
-            'date_field': 'CreatedAt',
-            'nested': False,
-            'arn_format': 'arn:aws:kendra:{region}:{account_id}:index/{index_id}/faq/{resource_id}',
-            'describe_method': 'describe_faq',
-            'describe_param': 'Id',
-            'requires_index': True
-        },
-        'Thesaurus': {
-            'method': 'list_thesauri',
-            'key': 'ThesaurusSummaryItems',
-            'id_field': 'Id',
-            'name_field': 'Name',
-            'date_field': 'CreatedAt',
-            'nested': False,
-            'arn_format': 'arn:aws:kendra:{region}:{account_id}:index/{index_id}/thesaurus/{resource_id}',
-            'describe_method': 'describe_thesaurus',
-            'describe_param': 'Id',
-            'requires_index': True
-        },
-        'Experience': {
-            'method': 'list_experiences',
-            'key': 'SummaryItems',
-            'id_field': 'Id',
-            'name_field': 'Name',
-            'date_field': 'CreatedAt',
-            'nested': False,
-            'arn_format': 'arn:aws:kendra:{region}:{account_id}:index/{index_id}/experience/{resource_id}',
-            'describe_method': 'describe_experience',
-            'describe_param': 'Id',
-            'requires_index': True
-        },
-        'QuerySuggestionsBlockList': {
-            'method': 'list_query_suggestions_block_lists',
-            'key': 'BlockListSummaryItems',
-            'id_field': 'Id',
-            'name_field': 'Name',
-            'date_field': 'CreatedAt',
-            'nested': False,
-            'arn_format': 'arn:aws:kendra:{region}:{account_id}:index/{index_id}/query-suggestions-block-list/{resource_id}',
-            'describe_method': 'describe_query_suggestions_block_list',
-            'describe_param': 'Id',
-            'requires_index': True
-        },
-        'FeaturedResultsSet': {
-            'method': 'list_featured_results_sets',
-            'key': 'FeaturedResultsSetSummaryItems',
-            'id_field': 'FeaturedResultsSetId',
-            'name_field': 'FeaturedResultsSetName',
-            'date_field': 'CreationTimestamp',
-            'nested': False,
-            'arn_format': 'arn:aws:kendra:{region}:{account_id}:index/{index_id}/featured-results-set/{resource_id}',
-            'describe_method': 'describe_featured_results_set',
-            'describe_param': 'FeaturedResultsSetId',
-            'requires_index': True
-        },
-        'AccessControlConfiguration': {
-            'method': 'list_access_control_configurations',
-            'key': 'AccessControlConfigurations',
-            'id_field': 'Id',
-            'name_field': 'Name',
-            'date_field': None,
-            'nested': False,
-            'arn_format': 'arn:aws:kendra:{region}:{account_id}:index/{index_id}/access-control-configuration/{resource_id}',
-            'describe_method': 'describe_access_control_configuration',
-            'describe_param': 'Id',
-            'requires_index': True
-        }
-    }
-    
-    return resource_configs
+    return _RESOURCE_CONFIGS
 
 
 def retry_with_backoff(func, max_retries=5, base_delay=1, max_delay=60):
     """
-    Retry function with exponential backoff for handling rate limiting
+    Retry function with jittered exponential backoff for handling rate limiting
     """
     for attempt in range(max_retries):
         try:
             return func()
         except ClientError as e:
             error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-            if error_code in ['TooManyRequestsException', 'Throttling', 'ThrottlingException']:
+            if error_code in THROTTLING_ERROR_CODES:
                 if attempt < max_retries - 1:
-                    delay = min(base_delay * (2 ** attempt), max_delay)
+                    # Full jitter keeps concurrent workers from retrying in lockstep
+                    delay = random.uniform(0, min(base_delay * (2 ** attempt), max_delay))
                     time.sleep(delay)
                     continue
             raise
-        except Exception as e:
-            raise
     return None
 
 
-def discovery(self, session, account_id, region, service, service_type, logger):    
-    
-    status = "success"
-    error_message = ""
-    resources = []
+def first_page_and_rest(pages):
+    """
+    Fetch the first page eagerly so API errors surface where they are handled, and stream the rest
+    """
+    first_page = next(pages, None)
+    if first_page is None:
+        return []
+    return itertools.chain([first_page], pages)
+
+
+def call_with_limit(func):
+    """
+    Run an API call while holding a slot of the shared concurrency limit
+    """
+    with _API_SEMAPHORE:
+        return func()
+
+
+def iterate_token_pages(method, **params):
+    """
+    Yield every response page of a Kendra list call by following NextToken (botocore has no Kendra paginators)
+    """
+    while True:
+        response = call_with_limit(lambda: method(**params))
+        yield response
+        next_token = response.get('NextToken')
+        if not next_token:
+            return
+        params['NextToken'] = next_token
+
+
+def get_kendra_client(session, region):
+    """
+    Kendra client for a session and region, created once and reused (clients are thread-safe, sessions are not)
+    """
+    with _CLIENT_CACHE_LOCK:
+        session_clients = _CLIENT_CACHE.setdefault(session, {})
+        if region not in session_clients:
+            session_clients[region] = session.client('kendra', region_name=region, config=CLIENT_CONFIG)
+        return session_clients[region]
+
+
+def list_index_ids(client):
+    """
+    All Kendra index ids in the client region
+    """
+    return [
+        idx['Id']
+        for page in iterate_token_pages(client.list_indices)
+        for idx in page.get('IndexConfigurationSummaryItems', [])
+    ]
+
+
+def get_index_ids(client, account_id, region, ttl=INDEX_CACHE_TTL):
+    """
+    Index ids for an account and region, listed once per TTL and shared across resource types
+    """
+    key = (account_id, region)
+    with _INDEX_CACHE_LOCK:
+        fetch_entry = _INDEX_FETCH_LOCKS.setdefault(key, [threading.Lock(), 0])
+        fetch_entry[1] += 1
 
     try:
-        service_types_list = get_service_types(account_id, region, service, service_type)        
-        if service_type not in service_types_list:
+        # Concurrent discoveries for the same account and region wait for a single list_indices sweep
+        with fetch_entry[0]:
+            with _INDEX_CACHE_LOCK:
+                cached = _INDEX_CACHE.get(key)
+            if cached and time.monotonic() - cached[0] < ttl:
+                if cached[2] is not None:
+                    raise cached[2]
+                return cached[1]
+
+            # A failed sweep is cached too, so one failure in a region without Kendra covers every index-scoped type
+            try:
+                index_ids = retry_with_backoff(lambda: list_index_ids(client), max_retries=3)
+            except (ClientError, BotoCoreError) as e:
+                with _INDEX_CACHE_LOCK:
+                    _INDEX_CACHE[key] = (time.monotonic(), None, e)
+                raise
+            if index_ids is not None:
+                with _INDEX_CACHE_LOCK:
+                    _INDEX_CACHE[key] = (time.monotonic(), index_ids, None)
+            return index_ids
+    finally:
+        with _INDEX_CACHE_LOCK:
+            fetch_entry[1] -= 1
+            if not fetch_entry[1]:
+                del _INDEX_FETCH_LOCKS[key]
+
+
+def invalidate_index_ids(account_id, region):
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE.pop((account_id, region), None)
+
+
+def discovery_iter(self, session, account_id, region, service, service_type, logger):
+    """
+    Yield discovered resources one at a time as KendraResource records, errors that should fail the scan are raised
+    """
+
+    executor = None
+
+    try:
+        if service_type not in _RESOURCE_CONFIGS:
             raise ValueError(f"Unsupported service type: {service_type}")
 
-        config = service_types_list[service_type]
-        
-        # Configure client with timeouts
-        client_config = Config(
-            read_timeout=15,
-            connect_timeout=10,
-            retries={'max_attempts': 3, 'mode': 'standard'}
-        )
+        config = _RESOURCE_CONFIGS[service_type]
         
         try:
-            client = session.client('kendra', region_name=region, config=client_config)
-        except Exception as e:
+            client = get_kendra_client(session, region)
+        except (BotoCoreError, ValueError) as e:
             logger.warning(f"Kendra client creation failed in region {region}: {str(e)}")
-            return f'{service}:{service_type}', "success", "", []
-        
-        if not hasattr(client, config['method']):
-            logger.warning(f"Method {config['method']} not available for kendra client")
-            return f'{service}:{service_type}', "success", "", []
+            return
 
+        # Method names are validated against the service model at import
         method = getattr(client, config['method'])
         params = {}
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS)
         
         # Special handling for resources that require index IDs
         if config.get('requires_index', False):
             # First get list of indexes
             try:
-                def get_indexes():
-                    return client.list_indices()
-                
-                indexes_response = retry_with_backoff(get_indexes, max_retries=3)
-                if not indexes_response:
-                    logger.info(f"No Kendra indexes found for {service_type} discovery")
-                    return f'{service}:{service_type}', "success", "", []
-                    
-                index_ids = [idx['Id'] for idx in indexes_response.get('IndexConfigurationSummaryItems', [])]
+                index_ids = get_index_ids(client, account_id, region)
                 if not index_ids:
                     logger.info(f"No Kendra indexes found for {service_type} discovery")
-                    return f'{service}:{service_type}', "success", "", []
+                    return
                 
-                # Get resources for each index
-                all_items = []
-                for index_id in index_ids:
+                # Get resources for each index concurrently
+                def get_index_resources(index_id):
                     try:
-                        def get_index_resources():
-                            index_params = {'IndexId': index_id}
-                            response = method(**index_params)
-                            items = response.get(config['key'], [])
+                        def list_index_resources():
+                            items = []
+                            for response in iterate_token_pages(method, IndexId=index_id):
+                                items.extend(response.get(config['key'], []))
                             
                             # Add index_id to each item for ARN construction
                             for item in items:
                                 item['_index_id'] = index_id
                             return items
                         
-                        index_items = retry_with_backoff(get_index_resources, max_retries=3)
-                        if index_items is not None:
-                            all_items.extend(index_items)
-                        else:
+                        index_items = retry_with_backoff(list_index_resources, max_retries=3)
+                        if index_items is None:
                             logger.warning(f"Failed to get {service_type} for index {index_id}")
-                            
-                    except Exception as index_error:
+                            return []
+                        return index_items
+
+                    except ClientError as index_error:
+                        # A vanished index means the cached index list is stale
+                        if index_error.response.get('Error', {}).get('Code') == 'ResourceNotFoundException':
+                            invalidate_index_ids(account_id, region)
                         logger.warning(f"Error getting {service_type} for index {index_id}: {index_error}")
-                        continue
-                        
-                page_iterator = [{config['key']: all_items}]
+                        return []
+                    except BotoCoreError as index_error:
+                        logger.warning(f"Error getting {service_type} for index {index_id}: {index_error}")
+                        return []
+
+                # One page per index, yielded as each index completes in order
+                page_iterator = (
+                    {config['key']: index_items}
+                    for index_items in executor.map(get_index_resources, index_ids)
+                )
                 
-            except Exception as index_error:
+            except (ClientError, BotoCoreError) as index_error:
                 logger.warning(f"Error listing indexes for {service_type}: {index_error}")
-                return f'{service}:{service_type}', "success", "", []
+                return
         else:
             # Handle Kendra API calls with proper error handling and retry logic
             try:
                 logger.info(f"Calling Kendra {config['method']} in region {region}")
                 
-                def get_resources():
+                def iterate_pages():
                     # Handle pagination
                     try:
                         paginator = client.get_paginator(config['method'])
-                        pages = []
-                        for page in paginator.paginate(**params):
-                            pages.append(page)
-                        return pages
+                        yield from paginator.paginate(**params)
                     except OperationNotPageableError:
-                        response = method(**params)
-                        return [response]
+                        yield from iterate_token_pages(method, **params)
+
+                def get_resources():
+                    return first_page_and_rest(iterate_pages())
                 
                 page_iterator = retry_with_backoff(get_resources, max_retries=5)
                 if page_iterator is None:
                     logger.warning(f"Failed to get {service_type} after retries")
-                    return f'{service}:{service_type}', "success", "", []
+                    return
                     
             except (ConnectTimeoutError, ReadTimeoutError) as e:
                 logger.warning(f"Kendra timeout in region {region}: {str(e)}")
-                return f'{service}:{service_type}', "success", "", []
+                return
             except ClientError as e:
                 error_code = e.response.get('Error', {}).get('Code', 'Unknown')
                 if error_code in ['UnauthorizedOperation', 'AccessDenied', 'InvalidAction']:
                     logger.warning(f"Kendra not available in region {region}: {error_code}")
-                    return f'{service}:{service_type}', "success", "", []
+                    return
                 elif error_code in ['ResourceNotFoundException', 'InvalidParameterException']:
                     logger.info(f"Kendra {service_type} not found in region {region}")
-                    return f'{service}:{service_type}', "success", "", []
+                    return
                 else:
                     logger.error(f"Kendra API error in region {region}: {str(e)}")
-                    return f'{service}:{service_type}', "error", str(e), []
-            except Exception as e:
+                    raise
+            except BotoCoreError as e:
                 logger.warning(f"Kendra general error in region {region}: {str(e)}")
-                return f'{service}:{service_type}', "success", "", []
+                return
+
+        def get_resource_tags(arn, resource_name):
+            # Get existing tags with retry logic
+            resource_tags = {}
+            try:
+                def get_tags():
+                    return client.list_tags_for_resource(ResourceARN=arn)
+                        
+                tags_response = retry_with_backoff(lambda: call_with_limit(get_tags), max_retries=3)
+                if tags_response:
+                    # Kendra returns tags as a list of Key-Value objects
+                    tags_list = tags_response.get('Tags', [])
+                    resource_tags = dict(map(_TAG_KEY_VALUE, tags_list))
+                else:
+                    logger.warning(f"Failed to get tags for Kendra resource {resource_name}")
+                    resource_tags = {}
+                            
+            except (ConnectTimeoutError, ReadTimeoutError):
+                logger.warning(f"Timeout retrieving tags for Kendra resource {resource_name}")
+                resource_tags = {}
+            except ClientError as tag_error:
+                tag_error_code = tag_error.response.get('Error', {}).get('Code', 'Unknown')
+                if tag_error_code in ['ResourceNotFoundException', 'AccessDenied']:
+                    logger.info(f"No tags found for Kendra resource {resource_name}")
+                    resource_tags = {}
+                else:
+                    logger.warning(f"Could not retrieve tags for {resource_name}: {tag_error}")
+                    resource_tags = {}
+            except BotoCoreError as tag_error:
+                logger.warning(f"Could not retrieve tags for {resource_name}: {tag_error}")
+                resource_tags = {}
+            return resource_tags
+
+        # Every Kendra ARN is scoped under an index in this account and region
+        arn_prefix = f'arn:aws:kendra:{region}:{account_id}:index/'
+        id_field, name_field, date_field, metadata_fields, arn_path, requires_index = _SERVICE_METADATA_EXTRACTOR[service_type]
 
         # Process results
         for page in page_iterator:
             items = page.get(config['key'], [])
 
+            # Build ARNs first and fetch tags for the whole page concurrently
+            pending = []
             for item in items:
                 try:
-                    resource_id = item[config['id_field']]
-                    resource_name = item.get(config['name_field'], resource_id) if config['name_field'] else resource_id
+                    resource_id = item[id_field]
+                    resource_name = item.get(name_field, resource_id) if name_field else resource_id
 
                     # Get creation date
                     creation_date = None
-                    if config['date_field'] and config['date_field'] in item:
-                        creation_date = item[config['date_field']]
+                    if date_field and date_field in item:
+                        creation_date = item[date_field]
                         if hasattr(creation_date, 'isoformat'):
                             creation_date = creation_date.isoformat()
 
-                    # Build ARN
-                    if config.get('requires_index', False):
-                        index_id = item.get('_index_id', '')
-                        arn = config['arn_format'].format(
-                            region=region,
-                            account_id=account_id,
-                            index_id=index_id,
-                            resource_id=resource_id
-                        )
+                    # Build ARN from the per-call prefix, concatenation avoids re-parsing a format template per item
+                    if requires_index:
+                        arn = arn_prefix + item.get('_index_id', '') + arn_path + resource_id
                     else:
-                        arn = config['arn_format'].format(
-                            region=region,
-                            account_id=account_id,
-                            resource_id=resource_id
-                        )
+                        arn = arn_prefix + resource_id
 
-                    # Get existing tags with retry logic
-                    resource_tags = {}
-                    try:
-                        def get_tags():
-                            return client.list_tags_for_resource(ResourceARN=arn)
-                        
-                        tags_response = retry_with_backoff(get_tags, max_retries=3)
-                        if tags_response:
-                            # Kendra returns tags as a list of Key-Value objects
-                            tags_list = tags_response.get('Tags', [])
-                            resource_tags = {tag.get('Key', ''): tag.get('Value', '') for tag in tags_list}
-                        else:
-                            logger.warning(f"Failed to get tags for Kendra resource {resource_name}")
-                            resource_tags = {}
-                            
-                    except (ConnectTimeoutError, ReadTimeoutError):
-                        logger.warning(f"Timeout retrieving tags for Kendra resource {resource_name}")
-                        resource_tags = {}
-                    except ClientError as tag_error:
-                        tag_error_code = tag_error.response.get('Error', {}).get('Code', 'Unknown')
-                        if tag_error_code in ['ResourceNotFoundException', 'AccessDenied']:
-                            logger.info(f"No tags found for Kendra resource {resource_name}")
-                            resource_tags = {}
-                        else:
-                            logger.warning(f"Could not retrieve tags for {resource_name}: {tag_error}")
-                            resource_tags = {}
-                    except Exception as tag_error:
-                        logger.warning(f"Could not retrieve tags for {resource_name}: {tag_error}")
-                        resource_tags = {}
+                    pending.append((item, resource_id, resource_name, creation_date, arn))
+                except (ClientError, KeyError, TypeError) as item_error:
+                    logger.warning(f"Error processing Kendra item: {str(item_error)}")
+                    continue
+
+            # Tag lookups for the page run on the shared executor, results come back in item order
+            page_tags = executor.map(
+                get_resource_tags,
+                [entry[4] for entry in pending],
+                [entry[2] for entry in pending]
+            )
 
+            for (item, resource_id, resource_name, creation_date, arn), resource_tags in zip(pending, page_tags):
+                try:
                     # Get additional metadata based on resource type
-                    additional_metadata = {}
-                    if service_type == 'Index':
-                        additional_metadata = {
-                            'Status': item.get('Status', ''),
-                            'Edition': item.get('Edition', ''),
-                            'UpdatedAt': item.get('UpdatedAt', ''),
-                            'Description': item.get('Description', '')
-                        }
-                    elif service_type == 'DataSource':
-                        additional_metadata = {
-                            'Type': item.get('Type', ''),
-                            'Status': item.get('Status', ''),
-                            'UpdatedAt': item.get('UpdatedAt', ''),
-                            'LanguageCode': item.get('LanguageCode', '')
-                        }
-                    elif service_type == 'FAQ':
-                        additional_metadata = {
-                            'Status': item.get('Status', ''),
-                            'UpdatedAt': item.get('UpdatedAt', ''),
-                            'FileFormat': item.get('FileFormat', ''),
-                            'LanguageCode': item.get('LanguageCode', '')
-                        }
-                    elif service_type == 'Thesaurus':
-                        additional_metadata = {
-                            'Status': item.get('Status', ''),
-                            'UpdatedAt': item.get('UpdatedAt', ''),
-                            'Description': item.get('Description', '')
-                        }
-                    elif service_type == 'Experience':
-                        additional_metadata = {
-                            'Status': item.get('Status', ''),
-                            'UpdatedAt': item.get('UpdatedAt', ''),
-                            'Endpoints': item.get('Endpoints', [])
-                        }
-                    elif service_type == 'QuerySuggestionsBlockList':
-                        additional_metadata = {
-                            'Status': item.get('Status', ''),
-                            'UpdatedAt': item.get('UpdatedAt', ''),
-                            'ItemCount': item.get('ItemCount', 0),
-                            'Description': item.get('Description', '')
-                        }
-                    elif service_type == 'FeaturedResultsSet':
-                        additional_metadata = {
-                            'Status': item.get('Status', ''),
-                            'LastUpdatedTimestamp': item.get('LastUpdatedTimestamp', ''),
-                            'Description': item.get('Description', '')
-                        }
-                    elif service_type == 'AccessControlConfiguration':
-                        additional_metadata = {
-                            'Description': item.get('Description', '')
-                        }
-
-                    # Combine original item with additional metadata
-                    metadata = {**item, **additional_metadata}
-
-                    resources.append({
-                        "account_id": account_id,
-                        "region": region,
-                        "service": service,
-                        "resource_type": service_type,
-                        "resource_id": resource_id,
-                        "name": resource_name,
-                        "creation_date": creation_date,
-                        "tags": resource_tags,
-                        "tags_number": len(resource_tags),
-                        "metadata": metadata,
-                        "arn": arn
-                    })
-                except Exception as item_error:
+                    additional_metadata = {field: item.get(field, default) for field, default in metadata_fields}
+
+                    # Combine original item with additional metadata, the item is not reused so update it in place
+                    metadata = item
+                    metadata.update(additional_metadata)
+
+                    # Timestamps become ISO strings once here so the record is plain JSON data
+                    for field, value in metadata.items():
+                        if hasattr(value, 'isoformat'):
+                            metadata[field] = value.isoformat()
+
+                    yield KendraResource(
+                        account_id=account_id,
+                        region=region,
+                        service=service,
+                        resource_type=service_type,
+                        resource_id=resource_id,
+                        name=resource_name,
+                        creation_date=creation_date,
+                        tags=resource_tags,
+                        tags_number=len(resource_tags),
+                        metadata=metadata,
+                        arn=arn
+                    )
+                except (ClientError, KeyError, TypeError) as item_error:
                     logger.warning(f"Error processing Kendra item: {str(item_error)}")
                     continue
 
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def get_cache_file(account_id, region, service_type):
+    # botocore version in the name invalidates entries when the SDK (and its service models) change
+    return os.path.join(DISCOVERY_CACHE_PATH, f'kendra_{account_id}_{region}_{service_type}_{botocore.__version__}.pkl')
+
+
+def load_cached_discovery(account_id, region, service_type, logger):
+    if DISCOVERY_CACHE_TTL <= 0:
+        return None
+    cache_file = get_cache_file(account_id, region, service_type)
+    try:
+        if time.time() - os.path.getmtime(cache_file) >= DISCOVERY_CACHE_TTL:
+            return None
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.PickleError, EOFError) as e:
+        logger.warning(f"Ignoring unreadable Kendra discovery cache {cache_file}: {e}")
+        return None
+
+
+def save_cached_discovery(account_id, region, service_type, result, logger):
+    if DISCOVERY_CACHE_TTL <= 0:
+        return
+    cache_file = get_cache_file(account_id, region, service_type)
+    try:
+        os.makedirs(DISCOVERY_CACHE_PATH, exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        temp_file = f'{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_file, 'wb') as f:
+            pickle.dump(result, f)
+        os.replace(temp_file, cache_file)
+    except (OSError, pickle.PickleError) as e:
+        logger.warning(f"Could not write Kendra discovery cache {cache_file}: {e}")
+
+
+def discovery(self, session, account_id, region, service, service_type, logger):    
+    
+    cached = load_cached_discovery(account_id, region, service_type, logger)
+    if cached is not None:
+        logger.info(f'Discovery for {service}:{service_type} served from cache. Found {len(cached[3])} {service_type.lower()}s')
+        return cached
+
+    status = "success"
+    error_message = ""
+    resources = []
+
+    try:
+        for resource in discovery_iter(self, session, account_id, region, service, service_type, logger):
+            resources.append(resource.to_dict())
+
         logger.info(f'Discovery completed for {service}:{service_type}. Found {len(resources)} {service_type.lower()}s')
 
     except Exception as e:
@@ -405,7 +617,11 @@ def discovery(self, session, account_id, region, service, service_type, logger):
         error_message = str(e)
         logger.error(f"Error in Kendra discover function: {error_message}")
 
-    return f'{service}:{service_type}', status, error_message, resources
+    result = (f'{service}:{service_type}', status, error_message, resources)
+    if status == "success":
+        save_cached_discovery(account_id, region, service_type, result, logger)
+
+    return result
 
 
 def tagging(account_id, region, service, client, resources, tags_string, tags_action, logger):
@@ -414,26 +630,24 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
     results = []    
     tags = parse_tags(tags_string)
 
-    # Create Kendra client with timeout protection
-    session = boto3.Session()
-    client_config = Config(
-        read_timeout=15,
-        connect_timeout=10,
-        retries={'max_attempts': 3, 'mode': 'standard'}
-    )
-    
-    try:
-        kendra_client = session.client('kendra', region_name=region, config=client_config)
-    except Exception as e:
-        logger.error(f"Failed to create Kendra client: {str(e)}")
-        return []
+    # Request payloads are the same for every resource, build them once
+    tags_list = [{'Key': tag['Key'], 'Value': tag['Value']} for tag in tags]
+    tag_keys = [tag['Key'] for tag in tags]
+
+    # Use the client handed in by the tagger (it carries the target account's role), otherwise the cached default one
+    if client is not None:
+        kendra_client = client
+    else:
+        try:
+            kendra_client = get_kendra_client(_DEFAULT_SESSION, region)
+        except (BotoCoreError, ValueError) as e:
+            logger.error(f"Failed to create Kendra client: {str(e)}")
+            return []
 
-    for resource in resources:
+    def tag_single_resource(resource):
         try:
             def tag_resource():
                 if tags_action == 1:  # Add tags
-                    # Convert tags to Kendra format (list of Key-Value objects)
-                    tags_list = [{'Key': tag['Key'], 'Value': tag['Value']} for tag in tags]
                     kendra_client.tag_resource(
                         ResourceARN=resource.arn,
                         Tags=tags_list
@@ -441,13 +655,13 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
                 elif tags_action == 2:  # Remove tags
                     kendra_client.untag_resource(
                         ResourceARN=resource.arn,
-                        TagKeys=[tag['Key'] for tag in tags]
+                        TagKeys=tag_keys
                     )
             
             # Use retry logic for tagging operations
-            retry_with_backoff(tag_resource, max_retries=3)
+            retry_with_backoff(lambda: call_with_limit(tag_resource), max_retries=3)
                 
-            results.append({
+            return {
                 'account_id': account_id,
                 'region': region,
                 'service': service,
@@ -455,12 +669,12 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
                 'arn': resource.arn,
                 'status': 'success',
                 'error': ""
-            })
+            }
             
         except Exception as e:
             logger.error(f"Error processing batch for {service} in {account_id}/{region}:{resource.identifier} # {str(e)}")
             
-            results.append({
+            return {
                 'account_id': account_id,
                 'region': region,
                 'service': service,
@@ -468,17 +682,18 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
                 'arn': resource.arn,
                 'status': 'error',
                 'error': str(e)
-            })    
+            }
+
+    # Tag resources concurrently, results keep the order of the input resources
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results.extend(executor.map(tag_single_resource, resources))
     
     return results
 
 
 def parse_tags(tags_string: str) -> List[Dict[str, str]]:
-    tags = []
-    for tag_pair in tags_string.split(','):
-        key, value = tag_pair.split(':')
-        tags.append({
-            'Key': key.strip(),
-            'Value': value.strip()
-        })
-    return tags
+    # maxsplit keeps values that contain ':' intact
+    return [
+        {'Key': key.strip(), 'Value': value.strip()}
+        for key, value in (tag_pair.split(':', 1) for tag_pair in tags_string.split(','))
+    ]
@@ -1,10 +1,53 @@
 import json
 import boto3
-import time
+import itertools
+import threading
+import weakref
+import concurrent.futures
+from collections import namedtuple
+from functools import lru_cache
 from typing import List, Dict, Tuple
-from botocore.exceptions import OperationNotPageableError, ClientError, ConnectTimeoutError, ReadTimeoutError
+from botocore.exceptions import (
+    OperationNotPageableError, ClientError, ConnectTimeoutError, ReadTimeoutError, EndpointConnectionError,
+    UnknownEndpointError, InvalidRegionError, EndpointResolutionError
+)
 from botocore.config import Config
 
+
+# Concurrent list_tags_for_resource calls per discovery and tag mutations per tagging batch
+MAX_WORKERS = 16
+
+# Shared client settings: adaptive retries rate limit on throttling. botocore retries every error kind alike,
+# including the EndpointConnectionError of regions without the service, so attempts are capped at 3
+CLIENT_CONFIG = Config(
+    read_timeout=15,
+    connect_timeout=10,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    max_pool_connections=MAX_WORKERS
+)
+
+_DEFAULT_SESSION = boto3.Session()
+_CLIENT_LOCK = threading.Lock()
+
+# Resource Groups Tagging API clients per session and region, entries go away with their session
+_RGTA_CLIENT_CACHE = weakref.WeakKeyDictionary()
+
+# Discoveries skipped for the rest of the run, (service, region) when the service has no endpoint in the
+# region and (service, region, account_id) when the account is not allowed to use it there
+_UNAVAILABLE = set()
+_UNAVAILABLE_LOCK = threading.Lock()
+
+# Errors that are about the region itself, the same for every account. botocore builds an endpoint for any
+# region name, so a region without the service shows up as an EndpointConnectionError (the host does not resolve)
+REGION_UNAVAILABLE_ERRORS = (EndpointConnectionError, UnknownEndpointError, InvalidRegionError, EndpointResolutionError)
+
+# Discovered resource record, converted to a dict only when handed back to the discovery lambda
+Resource = namedtuple('Resource', [
+    'account_id', 'region', 'service', 'resource_type', 'resource_id', 'name',
+    'creation_date', 'tags', 'tags_number', 'metadata', 'arn'
+])
+
+
 def get_service_types(account_id, region, service, service_type):
     """
     Amazon Kendra Intelligent Ranking resources that support tagging.
@@ -26,31 +69,96 @@ def get_service_types(account_id, region, service, service_type):
             'nested': False,
             'arn_format': 'arn:aws:kendra-ranking:{region}:{account_id}:rescore-execution-plan/{resource_id}',
             'describe_method': 'describe_rescore_execution_plan',
-            'describe_param': 'Id'
+            'describe_param': 'Id',
+            'page_size': 50,
+            'rgta_filter': 'kendra-ranking:rescore-execution-plan'
         }
     }
     
     return resource_configs
 
 
-def retry_with_backoff(func, max_retries=5, base_delay=1, max_delay=60):
+def get_rgta_client(session, region):
     """
-    Retry function with exponential backoff for handling rate limiting
+    Resource Groups Tagging API client for a session and region, created once and reused
+    (boto3 clients are thread-safe, sessions are not, so creation is serialized)
     """
-    for attempt in range(max_retries):
-        try:
-            return func()
-        except ClientError as e:
-            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-            if error_code in ['TooManyRequestsException', 'Throttling', 'ThrottlingException']:
-                if attempt < max_retries - 1:
-                    delay = min(base_delay * (2 ** attempt), max_delay)
-                    time.sleep(delay)
-                    continue
-            raise
-        except Exception as e:
-            raise
-    return None
+    with _CLIENT_LOCK:
+        session_clients = _RGTA_CLIENT_CACHE.setdefault(session, {})
+        if region not in session_clients:
+            session_clients[region] = session.client('resourcegroupstaggingapi', region_name=region, config=CLIENT_CONFIG)
+        return session_clients[region]
+
+
+def fetch_tags_via_rgta(session, region, resource_type_filter):
+    """
+    Fetch tags for every resource of the given type in the region using the
+    Resource Groups Tagging API, returned as {arn: {key: value}}.
+    Resources that never had tags are not returned by the API.
+    """
+    client = get_rgta_client(session, region)
+    paginator = client.get_paginator('get_resources')
+    tags_by_arn = {}
+    for page in paginator.paginate(ResourceTypeFilters=[resource_type_filter], PaginationConfig={'PageSize': 100}):
+        for mapping in page.get('ResourceTagMappingList', []):
+            tags_by_arn[mapping['ResourceARN']] = {tag['Key']: tag['Value'] for tag in mapping.get('Tags', [])}
+    return tags_by_arn
+
+
+def fetch_resource_tags(client, resource_id, arn):
+    """
+    Tags of a single plan as {key: value}, used for plans the Resource Groups Tagging API returned no tags for
+    """
+    tags_response = client.list_tags_for_resource(ResourceARN=arn)
+    # Kendra Ranking returns tags as a list of Key-Value objects
+    return {tag.get('Key', ''): tag.get('Value', '') for tag in tags_response.get('Tags', [])}
+
+
+def first_page_and_rest(pages):
+    """
+    Fetch the first page eagerly so API errors surface where they are handled, and stream the rest
+    """
+    first_page = next(pages, None)
+    if first_page is None:
+        return []
+    return itertools.chain([first_page], pages)
+
+
+def iterate_token_pages(method, **params):
+    """
+    Yield every response page of a list call by following NextToken (botocore has no Kendra Ranking paginators)
+    """
+    while True:
+        response = method(**params)
+        yield response
+        next_token = response.get('NextToken')
+        if not next_token:
+            return
+        params['NextToken'] = next_token
+
+
+def mark_unavailable(service, region, account_id=None):
+    """
+    Remember that the service is not available in the region, for every account or only for account_id,
+    so later discoveries return straight away
+    """
+    with _UNAVAILABLE_LOCK:
+        _UNAVAILABLE.add((service, region) if account_id is None else (service, region, account_id))
+
+
+def is_unavailable(service, region, account_id):
+    with _UNAVAILABLE_LOCK:
+        return (service, region) in _UNAVAILABLE or (service, region, account_id) in _UNAVAILABLE
+
+
+@lru_cache(maxsize=64)
+def _get_client(region):
+    """
+    Kendra Ranking client for the default session, cached per region (boto3 clients are thread-safe,
+    sessions are not, so creation is serialized)
+    """
+    with _CLIENT_LOCK:
+        return _DEFAULT_SESSION.client('kendra-ranking', region_name=region, config=CLIENT_CONFIG)
 
 
 def discovery(self, session, account_id, region, service, service_type, logger):    
@@ -59,24 +167,26 @@ def discovery(self, session, account_id, region, service, service_type, logger):
     error_message = ""
     resources = []
 
+    if is_unavailable(service, region, account_id):
+        logger.info(f"Skipping {service}:{service_type} in region {region}, service not available")
+        return f'{service}:{service_type}', status, error_message, resources
+
     try:
         service_types_list = get_service_types(account_id, region, service, service_type)        
         if service_type not in service_types_list:
             raise ValueError(f"Unsupported service type: {service_type}")
 
         config = service_types_list[service_type]
-        
-        # Configure client with timeouts
-        client_config = Config(
-            read_timeout=15,
-            connect_timeout=10,
-            retries={'max_attempts': 3, 'mode': 'standard'}
-        )
+
+        # Every ARN of the type shares this prefix, only the resource id is appended per item
+        arn_prefix = config['arn_format'].format(region=region, account_id=account_id, resource_id='')
         
         try:
-            client = session.client('kendra-ranking', region_name=region, config=client_config)
+            client = session.client('kendra-ranking', region_name=region, config=CLIENT_CONFIG)
         except Exception as e:
             logger.warning(f"Kendra Ranking client creation failed in region {region}: {str(e)}")
+            if isinstance(e, REGION_UNAVAILABLE_ERRORS):
+                mark_unavailable(service, region)
             return f'{service}:{service_type}', "success", "", []
         
         if not hasattr(client, config['method']):
@@ -86,27 +196,23 @@ def discovery(self, session, account_id, region, service, service_type, logger):
         method = getattr(client, config['method'])
         params = {}
         
-        # Handle Kendra Ranking API calls with proper error handling and retry logic
+        # Handle Kendra Ranking API calls with proper error handling, throttling is retried by botocore
         try:
             logger.info(f"Calling Kendra Ranking {config['method']} in region {region}")
             
-            def get_resources():
-                # Handle pagination
-                try:
-                    paginator = client.get_paginator(config['method'])
-                    pages = []
-                    for page in paginator.paginate(**params):
-                        pages.append(page)
-                    return pages
-                except OperationNotPageableError:
-                    response = method(**params)
-                    return [response]
-            
-            page_iterator = retry_with_backoff(get_resources, max_retries=5)
-            if page_iterator is None:
-                logger.warning(f"Failed to get {service_type} after retries")
-                return f'{service}:{service_type}', "success", "", []
+            # Handle pagination
+            try:
+                paginator = client.get_paginator(config['method'])
+                page_iterator = first_page_and_rest(iter(paginator.paginate(
+                    **params, PaginationConfig={'PageSize': config['page_size']}
+                )))
+            except OperationNotPageableError:
+                page_iterator = first_page_and_rest(iterate_token_pages(method, MaxResults=config['page_size'], **params))
                 
+        except REGION_UNAVAILABLE_ERRORS as e:
+            logger.warning(f"Kendra Ranking endpoint not reachable in region {region}: {str(e)}")
+            mark_unavailable(service, region)
+            return f'{service}:{service_type}', "success", "", []
         except (ConnectTimeoutError, ReadTimeoutError) as e:
             logger.warning(f"Kendra Ranking timeout in region {region}: {str(e)}")
             return f'{service}:{service_type}', "success", "", []
@@ -114,6 +220,8 @@ def discovery(self, session, account_id, region, service, service_type, logger):
             error_code = e.response.get('Error', {}).get('Code', 'Unknown')
             if error_code in ['UnauthorizedOperation', 'AccessDenied', 'InvalidAction']:
                 logger.warning(f"Kendra Ranking not available in region {region}: {error_code}")
+                # Permissions differ per account, other accounts still discover the region
+                mark_unavailable(service, region, account_id)
                 return f'{service}:{service_type}', "success", "", []
             elif error_code in ['ResourceNotFoundException', 'InvalidParameterException']:
                 logger.info(f"Kendra Ranking {service_type} not found in region {region}")
@@ -125,88 +233,114 @@ def discovery(self, session, account_id, region, service, service_type, logger):
             logger.warning(f"Kendra Ranking general error in region {region}: {str(e)}")
             return f'{service}:{service_type}', "success", "", []
 
-        # Process results
+        def fetch_tags(resource_id, arn, resource_name):
+            # Tags already returned by the Resource Groups Tagging API
+            resource_tags = rgta_tags.get(arn)
+            if resource_tags:
+                return resource_tags
+
+            # Get existing tags
+            try:
+                return fetch_resource_tags(client, resource_id, arn)
+                    
+            except (ConnectTimeoutError, ReadTimeoutError):
+                logger.warning(f"Timeout retrieving tags for Kendra Ranking resource {resource_name}")
+                return {}
+            except ClientError as tag_error:
+                tag_error_code = tag_error.response.get('Error', {}).get('Code', 'Unknown')
+                if tag_error_code in ['ResourceNotFoundException', 'AccessDenied']:
+                    logger.info(f"No tags found for Kendra Ranking resource {resource_name}")
+                else:
+                    logger.warning(f"Could not retrieve tags for {resource_name}: {tag_error}")
+                return {}
+            except Exception as tag_error:
+                logger.warning(f"Could not retrieve tags for {resource_name}: {tag_error}")
+                return {}
+
+        discovered = []
+
+        # Hoist config lookups and the append method out of the item loop
+        items_key = config['key']
+        id_field = config['id_field']
+        name_field = config['name_field']
+        date_field = config['date_field']
+        append_discovered = discovered.append
+
+        # Process results, tags are fetched afterwards in parallel
         for page in page_iterator:
-            items = page.get(config['key'], [])
+            items = page.get(items_key, [])
 
             for item in items:
                 try:
-                    resource_id = item[config['id_field']]
-                    resource_name = item.get(config['name_field'], resource_id) if config['name_field'] else resource_id
+                    resource_id = item[id_field]
+                    resource_name = item.get(name_field, resource_id) if name_field else resource_id
 
                     # Get creation date
                     creation_date = None
-                    if config['date_field'] and config['date_field'] in item:
-                        creation_date = item[config['date_field']]
+                    if date_field and date_field in item:
+                        creation_date = item[date_field]
                         if hasattr(creation_date, 'isoformat'):
                             creation_date = creation_date.isoformat()
 
                     # Build ARN
-                    arn = config['arn_format'].format(
-                        region=region,
-                        account_id=account_id,
-                        resource_id=resource_id
-                    )
-
-                    # Get existing tags with retry logic
-                    resource_tags = {}
-                    try:
-                        def get_tags():
-                            return client.list_tags_for_resource(ResourceARN=arn)
-                        
-                        tags_response = retry_with_backoff(get_tags, max_retries=3)
-                        if tags_response:
-                            # Kendra Ranking returns tags as a list of Key-Value objects
-                            tags_list = tags_response.get('Tags', [])
-                            resource_tags = {tag.get('Key', ''): tag.get('Value', '') for tag in tags_list}
-                        else:
-                            logger.warning(f"Failed to get tags for Kendra Ranking resource {resource_name}")
-                            resource_tags = {}
-                            
-                    except (ConnectTimeoutError, ReadTimeoutError):
-                        logger.warning(f"Timeout retrieving tags for Kendra Ranking resource {resource_name}")
-                        resource_tags = {}
-                    except ClientError as tag_error:
-                        tag_error_code = tag_error.response.get('Error', {}).get('Code', 'Unknown')
-                        if tag_error_code in ['ResourceNotFoundException', 'AccessDenied']:
-                            logger.info(f"No tags found for Kendra Ranking resource {resource_name}")
-                            resource_tags = {}
-                        else:
-                            logger.warning(f"Could not retrieve tags for {resource_name}: {tag_error}")
-                            resource_tags = {}
-                    except Exception as tag_error:
-                        logger.warning(f"Could not retrieve tags for {resource_name}: {tag_error}")
-                        resource_tags = {}
-
-                    # Get additional metadata for RescoreExecutionPlan
-                    additional_metadata = {}
-                    if service_type == 'RescoreExecutionPlan':
-                        additional_metadata = {
-                            'Status': item.get('Status', ''),
-                            'UpdatedAt': item.get('UpdatedAt', ''),
-                            'Description': item.get('Description', '')
-                        }
-
-                    # Combine original item with additional metadata
-                    metadata = {**item, **additional_metadata}
-
-                    resources.append({
-                        "account_id": account_id,
-                        "region": region,
-                        "service": service,
-                        "resource_type": service_type,
-                        "resource_id": resource_id,
-                        "name": resource_name,
-                        "creation_date": creation_date,
-                        "tags": resource_tags,
-                        "tags_number": len(resource_tags),
-                        "metadata": metadata,
-                        "arn": arn
-                    })
+                    arn = arn_prefix + resource_id
+
+                    append_discovered((item, resource_id, resource_name, creation_date, arn))
                 except Exception as item_error:
                     logger.warning(f"Error processing Kendra Ranking item: {str(item_error)}")
                     continue
 
+        # Get existing tags for all resources concurrently, the tagging API is only called when plans were listed
+        if discovered:
+            # Tags for the whole region in one paginated call, per-resource lookup is the fallback
+            try:
+                rgta_tags = fetch_tags_via_rgta(session, region, config['rgta_filter'])
+            except Exception as rgta_error:
+                logger.warning(f"Could not retrieve Kendra Ranking tags via Resource Groups Tagging API: {rgta_error}")
+                rgta_tags = {}
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(discovered))) as executor:
+                all_tags = list(executor.map(
+                    fetch_tags,
+                    [entry[1] for entry in discovered],
+                    [entry[4] for entry in discovered],
+                    [entry[2] for entry in discovered]
+                ))
+        else:
+            all_tags = []
+
+        append_resource = resources.append
+        for (item, resource_id, resource_name, creation_date, arn), resource_tags in zip(discovered, all_tags):
+            try:
+                # Get additional metadata for RescoreExecutionPlan
+                additional_metadata = {}
+                if service_type == 'RescoreExecutionPlan':
+                    additional_metadata = {
+                        'Status': item.get('Status', ''),
+                        'UpdatedAt': item.get('UpdatedAt', ''),
+                        'Description': item.get('Description', '')
+                    }
+
+                # Combine original item with additional metadata, the item is reused as is when it already has every field
+                metadata = item if all(key in item for key in additional_metadata) else {**item, **additional_metadata}
+
+                append_resource(Resource(
+                    account_id=account_id,
+                    region=region,
+                    service=service,
+                    resource_type=service_type,
+                    resource_id=resource_id,
+                    name=resource_name,
+                    creation_date=creation_date,
+                    tags=resource_tags,
+                    tags_number=len(resource_tags),
+                    metadata=metadata,
+                    arn=arn
+                ))
+            except Exception as item_error:
+                logger.warning(f"Error processing Kendra Ranking item: {str(item_error)}")
+                continue
+
         logger.info(f'Discovery completed for {service}:{service_type}. Found {len(resources)} {service_type.lower()}s')
 
     except Exception as e:
@@ -214,49 +348,54 @@ def discovery(self, session, account_id, region, service, service_type, logger):
         error_message = str(e)
         logger.error(f"Error in Kendra Ranking discover function: {error_message}")
 
-    return f'{service}:{service_type}', status, error_message, resources
+    return f'{service}:{service_type}', status, error_message, [resource._asdict() for resource in resources]
 
 
 def tagging(account_id, region, service, client, resources, tags_string, tags_action, logger):
     logger.info(f'Tagging # Account : {account_id}, Region : {region}, Service : {service}')
     
     results = []    
-    tags = parse_tags(tags_string)
 
-    # Create Kendra Ranking client with timeout protection
-    session = boto3.Session()
-    client_config = Config(
-        read_timeout=15,
-        connect_timeout=10,
-        retries={'max_attempts': 3, 'mode': 'standard'}
-    )
-    
-    try:
-        kendraranking_client = session.client('kendra-ranking', region_name=region, config=client_config)
-    except Exception as e:
-        logger.error(f"Failed to create Kendra Ranking client: {str(e)}")
+    if tags_action not in (1, 2):
+        logger.error(f"Invalid tags action {tags_action} for {service} in {account_id}/{region}, expected 1 (add) or 2 (remove)")
         return []
 
-    for resource in resources:
+    tags = parse_tags(tags_string)
+
+    # Request payloads are the same for every plan, build them once
+    tags_list = [{'Key': tag['Key'], 'Value': tag['Value']} for tag in tags]
+    tag_keys = [tag['Key'] for tag in tags]
+
+    # Use the client handed in by the tagger (it carries the target account's role), otherwise the cached default one
+    if client is not None:
+        kendraranking_client = client
+    else:
         try:
-            def tag_resource():
-                if tags_action == 1:  # Add tags
-                    # Convert tags to Kendra Ranking format (list of Key-Value objects)
-                    tags_list = [{'Key': tag['Key'], 'Value': tag['Value']} for tag in tags]
-                    kendraranking_client.tag_resource(
-                        ResourceARN=resource.arn,
-                        Tags=tags_list
-                    )
-                elif tags_action == 2:  # Remove tags
-                    kendraranking_client.untag_resource(
-                        ResourceARN=resource.arn,
-                        TagKeys=[tag['Key'] for tag in tags]
-                    )
-            
-            # Use retry logic for tagging operations
-            retry_with_backoff(tag_resource, max_retries=3)
+            kendraranking_client = _get_client(region)
+        except Exception as e:
+            logger.error(f"Failed to create Kendra Ranking client: {str(e)}")
+            return []
+
+    def add_tags(resource):
+        kendraranking_client.tag_resource(
+            ResourceARN=resource.arn,
+            Tags=tags_list
+        )
+
+    def remove_tags(resource):
+        kendraranking_client.untag_resource(
+            ResourceARN=resource.arn,
+            TagKeys=tag_keys
+        )
+
+    # The action is the same for every plan, pick the operation once
+    tag_operation = add_tags if tags_action == 1 else remove_tags
+
+    def tag_single_resource(resource):
+        try:
+            tag_operation(resource)
                 
-            results.append({
+            return {
                 'account_id': account_id,
                 'region': region,
                 'service': service,
@@ -264,12 +403,12 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
                 'arn': resource.arn,
                 'status': 'success',
                 'error': ""
-            })
+            }
             
         except Exception as e:
             logger.error(f"Error processing batch for {service} in {account_id}/{region}:{resource.identifier} # {str(e)}")
             
-            results.append({
+            return {
                 'account_id': account_id,
                 'region': region,
                 'service': service,
@@ -277,17 +416,19 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
                 'arn': resource.arn,
                 'status': 'error',
                 'error': str(e)
-            })    
+            }
+
+    # Tag resources concurrently, results keep the order of the input resources
+    if resources:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(resources))) as executor:
+            results.extend(executor.map(tag_single_resource, resources))
     
     return results
 
 
 def parse_tags(tags_string: str) -> List[Dict[str, str]]:
-    tags = []
-    for tag_pair in tags_string.split(','):
-        key, value = tag_pair.split(':')
-        tags.append({
-            'Key': key.strip(),
-            'Value': value.strip()
-        })
-    return tags
+    return [
+        {'Key': key.strip(), 'Value': value.strip()}
+        for key, separator, value in (tag_pair.partition(':') for tag_pair in tags_string.split(','))
+        if separator
+    ]
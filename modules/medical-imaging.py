@@ -1,7 +1,50 @@
 import json
 import boto3
+import threading
+import weakref
+import concurrent.futures
+from collections import namedtuple
+from functools import lru_cache
 from typing import List, Dict, Tuple
-from botocore.exceptions import OperationNotPageableError
+from botocore.exceptions import (
+    OperationNotPageableError, EndpointConnectionError,
+    UnknownEndpointError, InvalidRegionError, EndpointResolutionError
+)
+from botocore.config import Config
+
+
+# Concurrent tag_resource/untag_resource calls per tagging batch
+MAX_WORKERS = 16
+
+# Shared client settings: adaptive retries rate limit on throttling. botocore retries every error kind alike,
+# including the EndpointConnectionError of regions without the service, so attempts are capped at 3
+CLIENT_CONFIG = Config(
+    read_timeout=15,
+    connect_timeout=10,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    max_pool_connections=MAX_WORKERS
+)
+
+_DEFAULT_SESSION = boto3.Session()
+_CLIENT_LOCK = threading.Lock()
+
+# Resource Groups Tagging API clients per session and region, entries go away with their session
+_RGTA_CLIENT_CACHE = weakref.WeakKeyDictionary()
+
+# (service, region) pairs where the service has no endpoint, skipped for the rest of the run by every account
+_UNAVAILABLE = set()
+_UNAVAILABLE_LOCK = threading.Lock()
+
+# Errors that are about the region itself, the same for every account. botocore builds an endpoint for any
+# region name, so a region without the service shows up as an EndpointConnectionError (the host does not resolve)
+REGION_UNAVAILABLE_ERRORS = (EndpointConnectionError, UnknownEndpointError, InvalidRegionError, EndpointResolutionError)
+
+# Discovered resource record, converted to a dict only when handed back to the discovery lambda
+Resource = namedtuple('Resource', [
+    'account_id', 'region', 'service', 'resource_type', 'resource_id', 'name',
+    'creation_date', 'tags', 'tags_number', 'metadata', 'arn'
+])
+
 
 def get_service_types(account_id, region, service, service_type):
     """
@@ -20,19 +63,83 @@ def get_service_types(account_id, region, service, service_type):
             'name_field': 'datastoreName',
             'date_field': 'createdAt',
             'nested': False,
-            'arn_format': 'arn:aws:medical-imaging:{region}:{account_id}:datastore/{resource_id}'
+            'arn_format': 'arn:aws:medical-imaging:{region}:{account_id}:datastore/{resource_id}',
+            'page_size': 50,
+            'rgta_filter': 'medical-imaging:datastore'
         }
     }
     
     return resource_configs
 
 
+def get_rgta_client(session, region):
+    """
+    Resource Groups Tagging API client for a session and region, created once and reused
+    (boto3 clients are thread-safe, sessions are not, so creation is serialized)
+    """
+    with _CLIENT_LOCK:
+        session_clients = _RGTA_CLIENT_CACHE.setdefault(session, {})
+        if region not in session_clients:
+            session_clients[region] = session.client('resourcegroupstaggingapi', region_name=region, config=CLIENT_CONFIG)
+        return session_clients[region]
+
+
+def fetch_tags_via_rgta(session, region, resource_type_filter):
+    """
+    Fetch tags for every resource of the given type in the region using the
+    Resource Groups Tagging API, returned as {arn: {key: value}}.
+    Resources that never had tags are not returned by the API.
+    """
+    client = get_rgta_client(session, region)
+    paginator = client.get_paginator('get_resources')
+    tags_by_arn = {}
+    for page in paginator.paginate(ResourceTypeFilters=[resource_type_filter], PaginationConfig={'PageSize': 100}):
+        for mapping in page.get('ResourceTagMappingList', []):
+            tags_by_arn[mapping['ResourceARN']] = {tag['Key']: tag['Value'] for tag in mapping.get('Tags', [])}
+    return tags_by_arn
+
+
+def fetch_resource_tags(client, resource_id, arn):
+    """
+    Tags of a single datastore as {key: value}, used for datastores the Resource Groups Tagging API returned no tags for
+    """
+    tags_response = client.list_tags_for_resource(resourceArn=arn)
+    return tags_response.get('tags', {})
+
+
+def mark_unavailable(service, region):
+    """
+    Remember that the service is not available in the region so later discoveries return straight away
+    """
+    with _UNAVAILABLE_LOCK:
+        _UNAVAILABLE.add((service, region))
+
+
+def is_unavailable(service, region):
+    with _UNAVAILABLE_LOCK:
+        return (service, region) in _UNAVAILABLE
+
+
+@lru_cache(maxsize=64)
+def _get_client(region):
+    """
+    HealthImaging client for the default session, cached per region (boto3 clients are thread-safe,
+    sessions are not, so creation is serialized)
+    """
+    with _CLIENT_LOCK:
+        return _DEFAULT_SESSION.client('medical-imaging', region_name=region, config=CLIENT_CONFIG)
+
+
 def discovery(self, session, account_id, region, service, service_type, logger):    
     
     status = "success"
     error_message = ""
     resources = []
 
+    if is_unavailable(service, region):
+        logger.info(f"Skipping {service}:{service_type} in region {region}, service not available")
+        return f'{service}:{service_type}', status, error_message, resources
+
     try:
         
         service_types_list = get_service_types(account_id, region, service, service_type)        
@@ -40,9 +147,12 @@ def discovery(self, session, account_id, region, service, service_type, logger):
             raise ValueError(f"Unsupported service type: {service_type}")
 
         config = service_types_list[service_type]
+
+        # Every ARN of the type shares this prefix, only the resource id is appended per item
+        arn_prefix = config['arn_format'].format(region=region, account_id=account_id, resource_id='')
         
         # HealthImaging is regional
-        client = session.client('medical-imaging', region_name=region)
+        client = session.client('medical-imaging', region_name=region, config=CLIENT_CONFIG)
         
         if not hasattr(client, config['method']):
             raise ValueError(f"Method {config['method']} not available for medical-imaging client")
@@ -53,67 +163,87 @@ def discovery(self, session, account_id, region, service, service_type, logger):
         # Handle pagination
         try:
             paginator = client.get_paginator(config['method'])
-            page_iterator = paginator.paginate(**params)
+            page_iterator = paginator.paginate(**params, PaginationConfig={'PageSize': config['page_size']})
         except OperationNotPageableError:
             response = method(**params)
             page_iterator = [response]
 
+        def load_rgta_tags():
+            # Tags for the whole region in one paginated call, per-resource lookup is the fallback
+            try:
+                return fetch_tags_via_rgta(session, region, config['rgta_filter'])
+            except Exception as rgta_error:
+                logger.warning(f"Could not retrieve HealthImaging tags via Resource Groups Tagging API: {rgta_error}")
+                return {}
+
+        # Loaded for the first listed resource, regions without resources never call the tagging API
+        rgta_tags = None
+
+        # Hoist config lookups and the append method out of the item loop
+        items_key = config['key']
+        id_field = config['id_field']
+        name_field = config['name_field']
+        date_field = config['date_field']
+        append_resource = resources.append
+
         # Process each page of results
         for page in page_iterator:
-            items = page[config['key']]
+            items = page[items_key]
 
             for item in items:
-                resource_id = item[config['id_field']]
+                resource_id = item[id_field]
                 
                 # Get resource name
-                resource_name = item.get(config['name_field'], resource_id) if config['name_field'] else resource_id
+                resource_name = item.get(name_field, resource_id) if name_field else resource_id
 
                 # Get creation date
                 creation_date = None
-                if config['date_field'] and config['date_field'] in item:
-                    creation_date = item[config['date_field']]
+                if date_field and date_field in item:
+                    creation_date = item[date_field]
                     if hasattr(creation_date, 'isoformat'):
                         creation_date = creation_date.isoformat()
 
                 # Build ARN
-                arn = config['arn_format'].format(
-                    region=region,
-                    account_id=account_id,
-                    resource_id=resource_id
-                )
+                arn = arn_prefix + resource_id
 
                 # Get existing tags
-                resource_tags = {}
-                try:
-                    tags_response = client.list_tags_for_resource(resourceArn=arn)
-                    tags_dict = tags_response.get('tags', {})
-                    resource_tags = tags_dict
-                except Exception as tag_error:
-                    logger.warning(f"Could not retrieve tags for {resource_id}: {tag_error}")
-                    resource_tags = {}
-
-                resources.append({
-                    "account_id": account_id,
-                    "region": region,
-                    "service": service,
-                    "resource_type": service_type,
-                    "resource_id": resource_id,
-                    "name": resource_name,
-                    "creation_date": creation_date,
-                    "tags": resource_tags,
-                    "tags_number": len(resource_tags),
-                    "metadata": item,
-                    "arn": arn
-                })
+                if rgta_tags is None:
+                    rgta_tags = load_rgta_tags()
+                resource_tags = rgta_tags.get(arn)
+                if not resource_tags:
+                    try:
+                        resource_tags = fetch_resource_tags(client, resource_id, arn)
+                    except Exception as tag_error:
+                        logger.warning(f"Could not retrieve tags for {resource_id}: {tag_error}")
+                        resource_tags = {}
+
+                append_resource(Resource(
+                    account_id=account_id,
+                    region=region,
+                    service=service,
+                    resource_type=service_type,
+                    resource_id=resource_id,
+                    name=resource_name,
+                    creation_date=creation_date,
+                    tags=resource_tags,
+                    tags_number=len(resource_tags),
+                    metadata=item,
+                    arn=arn
+                ))
 
         logger.info(f'Discovery completed for {service}:{service_type}. Found {len(resources)} {service_type.lower()}s')
 
+    except REGION_UNAVAILABLE_ERRORS as e:
+        logger.warning(f"HealthImaging endpoint not reachable in region {region}: {str(e)}")
+        mark_unavailable(service, region)
+        resources = []
+
     except Exception as e:
         status = "error"
         error_message = str(e)
         logger.error(f"Error in discover function: {error_message}")
 
-    return f'{service}:{service_type}', status, error_message, resources
+    return f'{service}:{service_type}', status, error_message, [resource._asdict() for resource in resources]
 
 
 ####----| Tagging method
@@ -122,33 +252,48 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
     logger.info(f'Tagging # Account : {account_id}, Region : {region}, Service : {service}')
     
     results = []    
+
+    if tags_action not in (1, 2):
+        logger.error(f"Invalid tags action {tags_action} for {service} in {account_id}/{region}, expected 1 (add) or 2 (remove)")
+        return []
+
     tags = parse_tags(tags_string)
 
-    if tags_action == 2:        
-        tag_keys = [item['Key'] for item in tags]
+    # Request payloads are the same for every datastore, build them once
+    health_imaging_tags = {tag['Key']: tag['Value'] for tag in tags}
+    tag_keys = [item['Key'] for item in tags]
 
-    # Create HealthImaging client
-    session = boto3.Session()
-    medical_imaging_client = session.client('medical-imaging', region_name=region)
+    # Use the client handed in by the tagger (it carries the target account's role), otherwise the cached default one
+    if client is not None:
+        medical_imaging_client = client
+    else:
+        try:
+            medical_imaging_client = _get_client(region)
+        except Exception as e:
+            logger.error(f"Failed to create HealthImaging client: {str(e)}")
+            return []
+
+    def add_tags(resource):
+        # Add tags in HealthImaging format (dict)
+        medical_imaging_client.tag_resource(
+            resourceArn=resource.arn,
+            tags=health_imaging_tags
+        )
 
-    for resource in resources:            
+    def remove_tags(resource):
+        medical_imaging_client.untag_resource(
+            resourceArn=resource.arn,
+            tagKeys=tag_keys
+        )
+
+    # The action is the same for every datastore, pick the operation once
+    tag_operation = add_tags if tags_action == 1 else remove_tags
+
+    def tag_single_resource(resource):
         try:
-            if tags_action == 1:
-                # Add tags - Convert to HealthImaging format (dict)
-                health_imaging_tags = {tag['Key']: tag['Value'] for tag in tags}
-                medical_imaging_client.tag_resource(
-                    resourceArn=resource.arn,
-                    tags=health_imaging_tags
-                )
-                        
-            elif tags_action == 2:
-                # Remove tags
-                medical_imaging_client.untag_resource(
-                    resourceArn=resource.arn,
-                    tagKeys=tag_keys
-                )
+            tag_operation(resource)
                     
-            results.append({
+            return {
                 'account_id': account_id,
                 'region': region,
                 'service': service,
@@ -156,12 +301,12 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
                 'arn': resource.arn,
                 'status': 'success',
                 'error': ""
-            })
+            }
             
         except Exception as e:
             logger.error(f"Error processing {service} resource {resource.identifier}: {str(e)}")
             
-            results.append({
+            return {
                 'account_id': account_id,
                 'region': region,
                 'service': service,
@@ -169,17 +314,22 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
                 'arn': resource.arn,
                 'status': 'error',
                 'error': str(e)
-            })    
+            }
+
+    # Tag resources concurrently, results keep the order of the input resources
+    if resources:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(resources))) as executor:
+            results.extend(executor.map(tag_single_resource, resources))
     
     return results
 
 
 def parse_tags(tags_string):
     """Parse tags from string format to list of dictionaries"""
-    tags = []
-    if tags_string:
-        for tag_pair in tags_string.split(','):
-            if ':' in tag_pair:
-                key, value = tag_pair.split(':', 1)
-                tags.append({'Key': key.strip(), 'Value': value.strip()})
-    return tags
+    if not tags_string:
+        return []
+    return [
+        {'Key': key.strip(), 'Value': value.strip()}
+        for key, separator, value in (tag_pair.partition(':') for tag_pair in tags_string.split(','))
+        if separator
+    ]
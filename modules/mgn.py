@@ -1,7 +1,84 @@
 import json
+import time
+import random
 import boto3
+import threading
+import weakref
+import concurrent.futures
+from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Tuple
-from botocore.exceptions import OperationNotPageableError
+from botocore.exceptions import ClientError, OperationNotPageableError
+from botocore.config import Config
+
+
+# Concurrent tag API calls per discovery or tagging batch
+MAX_WORKERS = 16
+
+# Shared client settings: adaptive retries back off with full jitter and rate limit on throttling
+CLIENT_CONFIG = Config(
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    max_pool_connections=MAX_WORKERS,
+    tcp_keepalive=True
+)
+
+# Error codes left to the tagging retry pass when the client's own retries are exhausted
+THROTTLING_ERROR_CODES = (
+    'TooManyRequestsException',
+    'Throttling',
+    'ThrottlingException',
+    'RequestLimitExceeded'
+)
+
+# MGN clients per session and region, entries go away with their session
+_DEFAULT_SESSION = boto3.Session()
+_CLIENT_CACHE = weakref.WeakKeyDictionary()
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+# Static resource definitions, built once at import time and treated as read-only
+_RESOURCE_CONFIGS = {
+    'SourceServer': {
+        'method': 'describe_source_servers',
+        'key': 'items',
+        'id_field': 'arn',
+        'name_field': 'sourceServerID',
+        'date_field': None,  # Not available in list response
+        'nested': False,
+        'page_size': 1000,
+        'arn_format': None  # ARN is provided directly
+    },
+    'Application': {
+        'method': 'list_applications',
+        'key': 'items',
+        'id_field': 'arn',
+        'name_field': 'name',
+        'date_field': 'creationDateTime',
+        'nested': False,
+        'page_size': 1000,
+        'arn_format': None  # ARN is provided directly
+    },
+    'Wave': {
+        'method': 'list_waves',
+        'key': 'items',
+        'id_field': 'arn',
+        'name_field': 'name',
+        'date_field': 'creationDateTime',
+        'nested': False,
+        'page_size': 1000,
+        'arn_format': None  # ARN is provided directly
+    },
+    'Connector': {
+        'method': 'list_connectors',
+        'key': 'items',
+        'id_field': 'arn',
+        'name_field': 'name',
+        'date_field': None,  # Not available in list response
+        'nested': False,
+        'page_size': 1000,
+        'arn_format': None  # ARN is provided directly
+    }
+}
+
 
 def get_service_types(account_id, region, service, service_type):
     """
@@ -17,174 +94,217 @@ def get_service_types(account_id, region, service, service_type):
     Note: MGN is a regional service for application migration to AWS
     """
 
-    resource_configs = {
-        'SourceServer': {
-            'method': 'describe_source_servers',
-            'key': 'items',
-            'id_field': 'arn',
-            'name_field': None,  # Will use sourceServerID as name
-            'date_field': None,  # Not available in list response
-            'nested': False,
-            'arn_format': None  # ARN is provided directly
-        },
-        'Application': {
-            'method': 'list_applications',
-            'key': 'items',
-            'id_field': 'arn',
-            'name_field': 'name',
-            'date_field': 'creationDateTime',
-            'nested': False,
-            'arn_format': None  # ARN is provided directly
-        },
-        'Wave': {
-            'method': 'list_waves',
-            'key': 'items',
-            'id_field': 'arn',
-            'name_field': 'name',
-            'date_field': 'creationDateTime',
-            'nested': False,
-            'arn_format': None  # ARN is provided directly
-        },
-        'Connector': {
-            'method': 'list_connectors',
-            'key': 'items',
-            'id_field': 'arn',
-            'name_field': 'name',
-            'date_field': None,  # Not available in list response
-            'nested': False,
-            'arn_format': None  # ARN is provided directly
-        }
+    return _RESOURCE_CONFIGS
+
+
+def _iso(value):
+    """
+    ISO 8601 string for datetimes, any other value is returned unchanged
+    """
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+# SourceServer metadata fields as (name, path into the item, default), new fields only need a row here
+_SOURCE_SERVER_PATHS = (
+    ('sourceServerID', ('sourceServerID',), ''),
+    ('isArchived', ('isArchived',), False),
+    ('replicationType', ('replicationType',), ''),
+    ('dataReplicationState', ('dataReplicationInfo', 'dataReplicationState'), ''),
+    ('lifeCycleState', ('lifeCycle', 'state'), ''),
+    ('recommendedInstanceType', ('sourceProperties', 'recommendedInstanceType'), ''),
+    ('os', ('sourceProperties', 'os', 'fullString'), ''),
+    ('hostname', ('sourceProperties', 'identificationHints', 'hostname'), ''),
+    ('fqdn', ('sourceProperties', 'identificationHints', 'fqdn'), ''),
+    ('awsInstanceID', ('sourceProperties', 'identificationHints', 'awsInstanceID'), ''),
+    ('vcenterClientID', ('vcenterClientID',), ''),
+    ('lastSeenByServiceDateTime', ('lifeCycle', 'lastSeenByServiceDateTime'), '')
+)
+
+# Conversions applied to SourceServer fields after lookup
+_SOURCE_SERVER_POSTPROCESS = {
+    'lastSeenByServiceDateTime': _iso
+}
+
+
+def _deep_get(item, path, default):
+    """Value at path in nested dicts, default when a step is missing or not a dict"""
+    value = item
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return default
+        value = value[key]
+    return value
+
+
+def _meta_source_server(item):
+    metadata = {name: _deep_get(item, path, default) for name, path, default in _SOURCE_SERVER_PATHS}
+    for name, convert in _SOURCE_SERVER_POSTPROCESS.items():
+        metadata[name] = convert(metadata[name])
+    return metadata
+
+
+def _meta_application(item):
+    return {
+        'applicationID': item.get('applicationID', ''),
+        'description': item.get('description', ''),
+        'isArchived': item.get('isArchived', False),
+        'waveID': item.get('waveID', ''),
+        'lastModifiedDateTime': _iso(item.get('lastModifiedDateTime', ''))
     }
-    
-    return resource_configs
 
 
-def discovery(self, session, account_id, region, service, service_type, logger):    
+def _meta_wave(item):
+    return {
+        'waveID': item.get('waveID', ''),
+        'description': item.get('description', ''),
+        'isArchived': item.get('isArchived', False),
+        'status': item.get('status', ''),
+        'lastModifiedDateTime': _iso(item.get('lastModifiedDateTime', ''))
+    }
+
+
+def _meta_connector(item):
+    return {
+        'connectorID': item.get('connectorID', ''),
+        'ssmInstanceID': item.get('ssmInstanceID', ''),
+        'ssmCommandID': item.get('ssmCommandID', ''),
+        'capabilityArn': item.get('capabilityArn', '')
+    }
+
+
+# Additional metadata extractor per resource type, picked once per discovery
+_META_EXTRACTORS = {
+    'SourceServer': _meta_source_server,
+    'Application': _meta_application,
+    'Wave': _meta_wave,
+    'Connector': _meta_connector
+}
+
+
+def get_mgn_client(session, region):
+    """
+    MGN client for a session and region, created once and reused (clients are thread-safe, sessions are not)
+    """
+    with _CLIENT_CACHE_LOCK:
+        session_clients = _CLIENT_CACHE.setdefault(session, {})
+        if region not in session_clients:
+            session_clients[region] = session.client('mgn', region_name=region, config=CLIENT_CONFIG)
+        return session_clients[region]
+
+
+def discovery_iter(self, session, account_id, region, service, service_type, logger):
+    """
+    Yield discovered resources page by page, so callers can start on a page while the next one is fetched
+    """
+
+    if service_type not in _RESOURCE_CONFIGS:
+        raise ValueError(f"Unsupported service type: {service_type}")
+
+    config = _RESOURCE_CONFIGS[service_type]
     
-    status = "success"
-    error_message = ""
-    resources = []
+    # MGN is regional
+    client = get_mgn_client(session, region)
+    
+    if not hasattr(client, config['method']):
+        raise ValueError(f"Method {config['method']} not available for mgn client")
 
+    method = getattr(client, config['method'])
+    params = {}
+
+    # Handle pagination
     try:
-        
-        service_types_list = get_service_types(account_id, region, service, service_type)        
-        if service_type not in service_types_list:
-            raise ValueError(f"Unsupported service type: {service_type}")
-
-        config = service_types_list[service_type]
-        
-        # MGN is regional
-        client = session.client('mgn', region_name=region)
-        
-        if not hasattr(client, config['method']):
-            raise ValueError(f"Method {config['method']} not available for mgn client")
-
-        method = getattr(client, config['method'])
-        params = {}
-
-        # Handle pagination
+        paginator = client.get_paginator(config['method'])
+        page_iterator = paginator.paginate(**params, PaginationConfig={'PageSize': config['page_size']})
+    except OperationNotPageableError:
+        response = method(**params)
+        page_iterator = [response]
+
+    # Field names and the metadata extractor are fixed for the call, pick them once
+    items_key = config['key']
+    id_field = config['id_field']
+    name_field = config['name_field']
+    date_field = config['date_field']
+    extract_metadata = _META_EXTRACTORS[service_type]
+
+    # Keys shared by every record, copied per item instead of rebuilt
+    base_record = {
+        "account_id": account_id,
+        "region": region,
+        "service": service,
+        "resource_type": service_type
+    }
+
+    def fetch_tags(record):
         try:
-            paginator = client.get_paginator(config['method'])
-            page_iterator = paginator.paginate(**params)
-        except OperationNotPageableError:
-            response = method(**params)
-            page_iterator = [response]
+            tags_response = client.list_tags_for_resource(resourceArn=record['arn'])
+            return tags_response.get('tags', {})
+        except Exception as tag_error:
+            logger.warning(f"Could not retrieve tags for {record['name']}: {tag_error}")
+            return {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
 
         # Process each page of results
         for page in page_iterator:
-            items = page[config['key']]
+            items = page[items_key]
+            page_records = []
+
+            # Records of this page without inline tags, tagged before the page is yielded
+            needs_tags = []
 
             for item in items:
-                resource_id = item[config['id_field']]
+                resource_id = item[id_field]
                 
-                # Handle resource name based on type
-                if service_type == 'SourceServer':
-                    resource_name = item.get('sourceServerID', resource_id)
-                else:
-                    resource_name = item.get(config['name_field'], resource_id) if config['name_field'] else resource_id
+                # Get resource name
+                resource_name = item.get(name_field, resource_id) if name_field else resource_id
 
                 # Get creation date
                 creation_date = None
-                if config['date_field'] and config['date_field'] in item:
-                    creation_date = item[config['date_field']]
-                    if hasattr(creation_date, 'isoformat'):
-                        creation_date = creation_date.isoformat()
+                if date_field and date_field in item:
+                    creation_date = _iso(item[date_field])
 
                 # Build ARN - MGN provides ARN directly
                 arn = resource_id
 
-                # Get additional metadata based on resource type
-                additional_metadata = {}
-                if service_type == 'SourceServer':
-                    additional_metadata = {
-                        'sourceServerID': item.get('sourceServerID', ''),
-                        'isArchived': item.get('isArchived', False),
-                        'replicationType': item.get('replicationType', ''),
-                        'dataReplicationState': item.get('dataReplicationInfo', {}).get('dataReplicationState', ''),
-                        'lifeCycleState': item.get('lifeCycle', {}).get('state', ''),
-                        'recommendedInstanceType': item.get('sourceProperties', {}).get('recommendedInstanceType', ''),
-                        'os': item.get('sourceProperties', {}).get('os', {}).get('fullString', ''),
-                        'hostname': item.get('sourceProperties', {}).get('identificationHints', {}).get('hostname', ''),
-                        'fqdn': item.get('sourceProperties', {}).get('identificationHints', {}).get('fqdn', ''),
-                        'awsInstanceID': item.get('sourceProperties', {}).get('identificationHints', {}).get('awsInstanceID', ''),
-                        'vcenterClientID': item.get('vcenterClientID', ''),
-                        'lastSeenByServiceDateTime': item.get('lifeCycle', {}).get('lastSeenByServiceDateTime', '').isoformat() if hasattr(item.get('lifeCycle', {}).get('lastSeenByServiceDateTime', ''), 'isoformat') else item.get('lifeCycle', {}).get('lastSeenByServiceDateTime', '')
-                    }
-                elif service_type == 'Application':
-                    additional_metadata = {
-                        'applicationID': item.get('applicationID', ''),
-                        'description': item.get('description', ''),
-                        'isArchived': item.get('isArchived', False),
-                        'waveID': item.get('waveID', ''),
-                        'lastModifiedDateTime': item.get('lastModifiedDateTime', '').isoformat() if hasattr(item.get('lastModifiedDateTime', ''), 'isoformat') else item.get('lastModifiedDateTime', '')
-                    }
-                elif service_type == 'Wave':
-                    additional_metadata = {
-                        'waveID': item.get('waveID', ''),
-                        'description': item.get('description', ''),
-                        'isArchived': item.get('isArchived', False),
-                        'status': item.get('status', ''),
-                        'lastModifiedDateTime': item.get('lastModifiedDateTime', '').isoformat() if hasattr(item.get('lastModifiedDateTime', ''), 'isoformat') else item.get('lastModifiedDateTime', '')
-                    }
-                elif service_type == 'Connector':
-                    additional_metadata = {
-                        'connectorID': item.get('connectorID', ''),
-                        'ssmInstanceID': item.get('ssmInstanceID', ''),
-                        'ssmCommandID': item.get('ssmCommandID', ''),
-                        'capabilityArn': item.get('capabilityArn', '')
-                    }
-
                 # Get existing tags - MGN stores tags directly in the resource
-                resource_tags = {}
-                try:
-                    # For MGN, tags are usually stored directly in the item
-                    if 'tags' in item and isinstance(item['tags'], dict):
-                        resource_tags = item['tags']
-                    else:
-                        # Fallback to API call if needed
-                        tags_response = client.list_tags_for_resource(resourceArn=arn)
-                        tags_dict = tags_response.get('tags', {})
-                        resource_tags = tags_dict
-                except Exception as tag_error:
-                    logger.warning(f"Could not retrieve tags for {resource_name}: {tag_error}")
-                    resource_tags = {}
-
-                # Combine original item with additional metadata
-                metadata = {**item, **additional_metadata}
-
-                resources.append({
-                    "account_id": account_id,
-                    "region": region,
-                    "service": service,
-                    "resource_type": service_type,
-                    "resource_id": resource_id,
-                    "name": resource_name,
-                    "creation_date": creation_date,
-                    "tags": resource_tags,
-                    "tags_number": len(resource_tags),
-                    "metadata": metadata,
-                    "arn": arn
-                })
+                raw_tags = item.get('tags')
+                has_tags = isinstance(raw_tags, dict)
+                resource_tags = raw_tags if has_tags else {}
+
+                # Combine original item with additional metadata based on resource type
+                metadata = {**item, **extract_metadata(item)}
+
+                record = base_record.copy()
+                record["resource_id"] = resource_id
+                record["name"] = resource_name
+                record["creation_date"] = creation_date
+                record["tags"] = resource_tags
+                record["tags_number"] = len(resource_tags)
+                record["metadata"] = metadata
+                record["arn"] = arn
+                page_records.append(record)
+
+                if not has_tags:
+                    # Fallback to API call, done concurrently for the whole page
+                    needs_tags.append(record)
+
+            # Fetch the missing tags concurrently
+            for record, resource_tags in zip(needs_tags, executor.map(fetch_tags, needs_tags)):
+                record["tags"] = resource_tags
+                record["tags_number"] = len(resource_tags)
+
+            yield from page_records
+
+
+def discovery(self, session, account_id, region, service, service_type, logger):    
+    
+    status = "success"
+    error_message = ""
+    resources = []
+
+    try:
+        for resource in discovery_iter(self, session, account_id, region, service, service_type, logger):
+            resources.append(resource)
 
         logger.info(f'Discovery completed for {service}:{service_type}. Found {len(resources)} {service_type.lower()}s')
 
@@ -197,21 +317,36 @@ def discovery(self, session, account_id, region, service, service_type, logger):
 
 
 ####----| Tagging method
-def tagging(account_id, region, service, client, resources, tags_string, tags_action, logger):
+def tagging(account_id, region, service, client, resources, tags_string, tags_action, logger, dedupe=True):
     
     logger.info(f'Tagging # Account : {account_id}, Region : {region}, Service : {service}')
     
     results = []    
     tags = parse_tags(tags_string)
 
+    # The same ARN listed twice (e.g. from merged discovery runs) is tagged once, dedupe=False keeps a row per entry
+    if dedupe:
+        seen = set()
+        resources = [resource for resource in resources if not (resource.arn in seen or seen.add(resource.arn))]
+
     if tags_action == 2:        
         tag_keys = list(tags.keys()) if isinstance(tags, dict) else [tag['Key'] for tag in tags]
 
-    # Create MGN client
-    session = boto3.Session()
-    mgn_client = session.client('mgn', region_name=region)
+    # Use the client handed in by the tagger (built with adaptive retries there), or the cached one for the region when there is none
+    mgn_client = client if client is not None else get_mgn_client(_DEFAULT_SESSION, region)
 
-    for resource in resources:            
+    def result_row(resource, status, error):
+        return {
+            'account_id': account_id,
+            'region': region,
+            'service': service,
+            'identifier': resource.identifier,
+            'arn': resource.arn,
+            'status': status,
+            'error': error
+        }
+
+    def tag_single_resource(resource, final=True):
         try:
             if tags_action == 1:
                 # Add tags - Convert to MGN format (dictionary)
@@ -232,38 +367,47 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
                     tagKeys=tag_keys
                 )
                     
-            results.append({
-                'account_id': account_id,
-                'region': region,
-                'service': service,
-                'identifier': resource.identifier,
-                'arn': resource.arn,
-                'status': 'success',
-                'error': ""
-            })
-            
+            return result_row(resource, 'success', "")
+
+        except ClientError as e:
+            # Still throttled after the client retries, leave it for the retry pass
+            if not final and e.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES:
+                return None
+            logger.error(f"Error processing {service} resource {resource.identifier}: {str(e)}")
+            return result_row(resource, 'error', str(e))
+
         except Exception as e:
             logger.error(f"Error processing {service} resource {resource.identifier}: {str(e)}")
-            
-            results.append({
-                'account_id': account_id,
-                'region': region,
-                'service': service,
-                'identifier': resource.identifier,
-                'arn': resource.arn,
-                'status': 'error',
-                'error': str(e)
-            })    
+            return result_row(resource, 'error', str(e))
+
+    # Tag resources concurrently, results keep the order of the input resources
+    if resources:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(resources))) as executor:
+            results.extend(executor.map(lambda resource: tag_single_resource(resource, final=False), resources))
+
+            # One more pass for the throttled resources, after a jittered pause so they don't retry in lockstep
+            throttled = [index for index, result in enumerate(results) if result is None]
+            if throttled:
+                logger.warning(f"Retrying {len(throttled)} throttled {service} resources")
+                time.sleep(random.uniform(0.5, 1.5))
+                retried = executor.map(tag_single_resource, [resources[index] for index in throttled])
+                for index, result in zip(throttled, retried):
+                    results[index] = result
     
     return results
 
 
+@lru_cache(maxsize=128)
+def _parse_tags_cached(tags_string):
+    """Parse tags once per distinct string, as immutable (key, value) pairs"""
+    if not tags_string:
+        return ()
+    split = [tag_pair.split(':', 1) for tag_pair in tags_string.split(',') if ':' in tag_pair]
+    # Built through a dict so a repeated key keeps its last value
+    return tuple({key.strip(): value.strip() for key, value in split}.items())
+
+
 def parse_tags(tags_string):
     """Parse tags from string format to dictionary"""
-    tags = {}
-    if tags_string:
-        for tag_pair in tags_string.split(','):
-            if ':' in tag_pair:
-                key, value = tag_pair.split(':', 1)
-                tags[key.strip()] = value.strip()
-    return tags
+    # A fresh dict per call, so callers can change it without touching the cached pairs
+    return dict(_parse_tags_cached(tags_string))
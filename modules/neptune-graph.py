@@ -1,9 +1,192 @@
 import json
+from copy import copy
+import time
 import boto3
+import botocore.session
+from botocore import xform_name
+import threading
+import weakref
+import concurrent.futures
+from functools import lru_cache, partial
 from typing import List, Dict, Tuple
 from botocore.exceptions import OperationNotPageableError, ClientError, ConnectTimeoutError, ReadTimeoutError
 from botocore.config import Config
 
+
+# Concurrent list/tag calls per discovery or tagging batch
+MAX_WORKERS = 16
+
+# Session for tagging without a tagger client, created on first use and shared by later calls
+_DEFAULT_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+# Neptune Analytics clients per session and region, entries go away with their session
+_CLIENT_CACHE = weakref.WeakKeyDictionary()
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+# Graph ids per (account_id, region), shared by the graph-scoped resource types, a TTL of 0 disables the cache
+GRAPH_CACHE_TTL = 60
+_GRAPH_CACHE = {}
+_GRAPH_CACHE_LOCK = threading.Lock()
+# Per-key [lock, users] for in-flight sweeps, an entry is dropped with its last user
+_GRAPH_FETCH_LOCKS = {}
+
+# Shared client configuration, keep-alive and a larger pool let concurrent calls reuse warm connections
+CLIENT_CONFIG = Config(
+    read_timeout=15,
+    connect_timeout=10,
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={'max_attempts': 2, 'mode': 'standard'}
+)
+
+
+# Static resource definitions, built once at import time and treated as read-only
+_RESOURCE_CONFIGS = {
+    'Graph': {
+        'method': 'list_graphs',
+        'key': 'graphs',
+        'id_field': 'id',
+        'name_field': 'name',
+        'date_field': 'createTime',
+        'nested': False,
+        'page_size': 100,  # Service maximum for maxResults
+        'arn_field': 'arn',  # Returned in the list response
+        'arn_format': 'arn:aws:neptune-graph:{region}:{account_id}:graph/{resource_id}',
+        'rgta_filter': 'neptune-graph:graph',
+        'describe_method': 'get_graph',
+        'describe_param': 'graphIdentifier'
+    },
+    'GraphSnapshot': {
+        'method': 'list_graph_snapshots',
+        'key': 'graphSnapshots',
+        'id_field': 'id',
+        'name_field': 'name',
+        'date_field': 'snapshotCreateTime',
+        'nested': False,
+        'page_size': 100,  # Service maximum for maxResults
+        'arn_field': 'arn',  # Returned in the list response
+        'arn_format': 'arn:aws:neptune-graph:{region}:{account_id}:snapshot/{resource_id}',
+        'rgta_filter': 'neptune-graph:snapshot',
+        'describe_method': 'get_graph_snapshot',
+        'describe_param': 'snapshotIdentifier'
+    },
+    'PrivateGraphEndpoint': {
+        'method': 'list_private_graph_endpoints',
+        'key': 'privateGraphEndpoints',
+        'id_field': 'privateGraphEndpointIdentifier',
+        'name_field': 'privateGraphEndpointIdentifier',
+        'date_field': 'createTime',
+        'nested': False,
+        'page_size': 100,  # Service maximum for maxResults
+        'arn_field': None,
+        'arn_format': 'arn:aws:neptune-graph:{region}:{account_id}:private-graph-endpoint/{resource_id}',
+        'rgta_filter': 'neptune-graph:private-graph-endpoint',
+        'describe_method': 'get_private_graph_endpoint',
+        'describe_param': 'privateGraphEndpointIdentifier',
+        'requires_graph': True
+    },
+    'ImportTask': {
+        'method': 'list_import_tasks',
+        'key': 'tasks',
+        'id_field': 'taskId',
+        'name_field': 'taskId',
+        'date_field': 'createTime',
+        'nested': False,
+        'page_size': 100,  # Service maximum for maxResults
+        'arn_field': None,
+        'arn_format': 'arn:aws:neptune-graph:{region}:{account_id}:import-task/{resource_id}',
+        'rgta_filter': 'neptune-graph:import-task',
+        'describe_method': 'get_import_task',
+        'describe_param': 'taskIdentifier'
+    },
+    'ExportTask': {
+        'method': 'list_export_tasks',
+        'key': 'tasks',
+        'id_field': 'taskId',
+        'name_field': 'taskId',
+        'date_field': 'createTime',
+        'nested': False,
+        'page_size': 100,  # Service maximum for maxResults
+        'arn_field': None,
+        'arn_format': 'arn:aws:neptune-graph:{region}:{account_id}:export-task/{resource_id}',
+        'rgta_filter': 'neptune-graph:export-task',
+        'describe_method': 'get_export_task',
+        'describe_param': 'taskIdentifier'
+    },
+    'Query': {
+        'method': 'list_queries',
+        'key': 'queries',
+        'id_field': 'id',
+        'name_field': 'queryString',
+        'date_field': 'createTime',
+        'nested': False,
+        'page_size': 100,  # Service maximum for maxResults
+        'arn_field': None,
+        'arn_format': 'arn:aws:neptune-graph:{region}:{account_id}:query/{resource_id}',
+        'rgta_filter': 'neptune-graph:query',
+        'describe_method': 'get_query',
+        'describe_param': 'queryId',
+        'requires_graph': True
+    }
+}
+
+
+# Additional metadata fields per resource type as (field, default when missing from the item),
+# defaults are shared across records and must not be mutated
+_METADATA_FIELDS = {
+    'Graph': (
+        ('status', ''),
+        ('statusReason', ''),
+        ('endpoint', ''),
+        ('replicaCount', 0),
+        ('kmsKeyIdentifier', ''),
+        ('sourceSnapshotId', ''),
+        ('deletionProtection', False),
+        ('buildNumber', ''),
+        ('provisionedMemory', 0)
+    ),
+    'GraphSnapshot': (
+        ('sourceGraphId', ''),
+        ('status', ''),
+        ('kmsKeyIdentifier', ''),
+        ('snapshotType', ''),
+        ('statusReason', '')
+    ),
+    'PrivateGraphEndpoint': (
+        ('graphIdentifier', ''),
+        ('vpcId', ''),
+        ('subnetIds', []),
+        ('status', ''),
+        ('vpcEndpointId', '')
+    ),
+    'ImportTask': (
+        ('graphId', ''),
+        ('source', ''),
+        ('format', ''),
+        ('status', ''),
+        ('roleArn', ''),
+        ('importOptions', {}),
+        ('importedGraphSummary', {})
+    ),
+    'ExportTask': (
+        ('graphId', ''),
+        ('destination', ''),
+        ('format', ''),
+        ('status', ''),
+        ('roleArn', ''),
+        ('exportTaskDetails', {})
+    ),
+    'Query': (
+        ('graphIdentifier', ''),
+        ('state', ''),
+        ('elapsed', 0),
+        ('queryString', ''),
+        ('waited', 0)
+    )
+}
+
+
 def get_service_types(account_id, region, service, service_type):
     """
     Amazon Neptune Analytics resources that support tagging.
@@ -23,266 +206,275 @@ def get_service_types(account_id, region, service, service_type):
     fast analytics on graph data using popular graph query languages.
     """
 
-    resource_configs = {
-        'Graph': {
-            'method': 'list_graphs',
-            'key': 'graphs',
-            'id_field': 'id',
-            'name_field': 'name',
-            'date_field': 'createTime',
-            'nested': False,
-            'arn_format': 'arn:aws:neptune-graph:{region}:{account_id}:graph/{resource_id}',
-            'describe_method': 'get_graph',
-            'describe_param': 'graphIdentifier'
-        },
-        'GraphSnapshot': {
-            'method': 'list_graph_snapshots',
-            'key': 'graphSnapshots',
-            'id_field': 'id',
-            'name_field': 'name',
-            'date_field': 'snapshotCreateTime',
-            'nested': False,
-            'arn_format': 'arn:aws:neptune-graph:{region}:{account_id}:snapshot/{resource_id}',
-            'describe_method': 'get_graph_snapshot',
-            'describe_param': 'snapshotIdentifier'
-        },
-        'PrivateGraphEndpoint': {
-            'method': 'list_private_graph_endpoints',
-            'key': 'privateGraphEndpoints',
-            'id_field': 'privateGraphEndpointIdentifier',
-            'name_field': 'privateGraphEndpointIdentifier',
-            'date_field': 'createTime',
-            'nested': False,
-            'arn_format': 'arn:aws:neptune-graph:{region}:{account_id}:private-graph-endpoint/{resource_id}',
-            'describe_method': 'get_private_graph_endpoint',
-            'describe_param': 'privateGraphEndpointIdentifier',
-            'requires_graph': True
-        },
-        'ImportTask': {
-            'method': 'list_import_tasks',
-            'key': 'tasks',
-            'id_field': 'taskId',
-            'name_field': 'taskId',
-            'date_field': 'createTime',
-            'nested': False,
-            'arn_format': 'arn:aws:neptune-graph:{region}:{account_id}:import-task/{resource_id}',
-            'describe_method': 'get_import_task',
-            'describe_param': 'taskIdentifier'
-        },
-        'ExportTask': {
-            'method': 'list_export_tasks',
-            'key': 'tasks',
-            'id_field': 'taskId',
-            'name_field': 'taskId',
-            'date_field': 'createTime',
-            'nested': False,
-            'arn_format': 'arn:aws:neptune-graph:{region}:{account_id}:export-task/{resource_id}',
-            'describe_method': 'get_export_task',
-            'describe_param': 'taskIdentifier'
-        },
-        'Query': {
-            'method': 'list_queries',
-            'key': 'queries',
-            'id_field': 'id',
-            'name_field': 'queryString',
-            'date_field': 'createTime',
-            'nested': False,
-            'arn_format': 'arn:aws:neptune-graph:{region}:{account_id}:query/{resource_id}',
-            'describe_method': 'get_query',
-            'describe_param': 'queryId',
-            'requires_graph': True
-        }
-    }
-    
-    return resource_configs
+    return _RESOURCE_CONFIGS
 
 
-def discovery(self, session, account_id, region, service, service_type, logger):    
-    
-    status = "success"
-    error_message = ""
-    resources = []
+@lru_cache(maxsize=None)
+def unsupported_methods():
+    """
+    Configured list methods that are not neptune-graph operations in the installed botocore, checked once per process
+    """
+    service_model = botocore.session.get_session().get_service_model('neptune-graph')
+    methods = {xform_name(operation) for operation in service_model.operation_names}
+    return frozenset(config['method'] for config in _RESOURCE_CONFIGS.values()) - methods
+
+
+def get_default_session():
+    global _DEFAULT_SESSION
+    with _SESSION_LOCK:
+        if _DEFAULT_SESSION is None:
+            _DEFAULT_SESSION = boto3.Session()
+        return _DEFAULT_SESSION
+
+
+def fetch_tags_via_rgta(session, region, resource_type_filter):
+    """
+    Fetch tags for every resource of the given type in the region using the
+    Resource Groups Tagging API, returned as {arn: {key: value}}.
+    Resources that never had tags are not returned by the API.
+    """
+    client = session.client('resourcegroupstaggingapi', region_name=region, config=CLIENT_CONFIG)
+    paginator = client.get_paginator('get_resources')
+    tags_by_arn = {}
+    for page in paginator.paginate(ResourceTypeFilters=[resource_type_filter], PaginationConfig={'PageSize': 100}):
+        for mapping in page.get('ResourceTagMappingList', []):
+            tags_by_arn[mapping['ResourceARN']] = {tag['Key']: tag['Value'] for tag in mapping.get('Tags', [])}
+    return tags_by_arn
+
+
+def get_neptune_graph_client(session, region):
+    """
+    Neptune Analytics client for a session and region, created once and reused (clients are thread-safe, sessions are not)
+    """
+    with _CLIENT_CACHE_LOCK:
+        session_clients = _CLIENT_CACHE.setdefault(session, {})
+        if region not in session_clients:
+            session_clients[region] = session.client('neptune-graph', region_name=region, config=CLIENT_CONFIG)
+        return session_clients[region]
+
+
+def list_graph_ids(client):
+    graph_ids = []
+    pages = client.get_paginator('list_graphs').paginate(
+        PaginationConfig={'PageSize': _RESOURCE_CONFIGS['Graph']['page_size']}
+    )
+    for page in pages:
+        graph_ids.extend(graph['id'] for graph in page.get('graphs', []))
+    return graph_ids
+
+
+def get_graph_ids(client, account_id, region, ttl=None):
+    """
+    Graph ids for an account and region, listed once per TTL and shared across resource types
+    """
+    ttl = GRAPH_CACHE_TTL if ttl is None else ttl
+    if ttl <= 0:
+        return list_graph_ids(client)
+
+    key = (account_id, region)
+    with _GRAPH_CACHE_LOCK:
+        fetch_entry = _GRAPH_FETCH_LOCKS.setdefault(key, [threading.Lock(), 0])
+        fetch_entry[1] += 1
+
+    try:
+        # Concurrent discoveries for the same account and region wait for a single list_graphs sweep
+        with fetch_entry[0]:
+            with _GRAPH_CACHE_LOCK:
+                cached = _GRAPH_CACHE.get(key)
+            if cached and time.monotonic() - cached[0] < ttl:
+                return cached[1]
+
+            graph_ids = list_graph_ids(client)
+            with _GRAPH_CACHE_LOCK:
+                _GRAPH_CACHE[key] = (time.monotonic(), graph_ids)
+            return graph_ids
+    finally:
+        with _GRAPH_CACHE_LOCK:
+            fetch_entry[1] -= 1
+            if not fetch_entry[1]:
+                del _GRAPH_FETCH_LOCKS[key]
+
+
+def invalidate_graph_ids(account_id, region):
+    with _GRAPH_CACHE_LOCK:
+        _GRAPH_CACHE.pop((account_id, region), None)
+
+
+def discovery_iter(self, session, account_id, region, service, service_type, logger):
+    """
+    Yield discovered resources page by page, errors that should fail the scan are raised
+    """
+
+    if service_type not in _RESOURCE_CONFIGS:
+        raise ValueError(f"Unsupported service type: {service_type}")
+
+    config = _RESOURCE_CONFIGS[service_type]
+
+    # Checked against the service model once per process, before any client is built
+    if config['method'] in unsupported_methods():
+        logger.warning(f"Method {config['method']} not available for neptune-graph client")
+        return
 
     try:
-        service_types_list = get_service_types(account_id, region, service, service_type)        
-        if service_type not in service_types_list:
-            raise ValueError(f"Unsupported service type: {service_type}")
-
-        config = service_types_list[service_type]
-        
-        # Configure client with timeouts
-        client_config = Config(
-            read_timeout=15,
-            connect_timeout=10,
-            retries={'max_attempts': 2, 'mode': 'standard'}
-        )
-        
+        client = get_neptune_graph_client(session, region)
+    except Exception as e:
+        logger.warning(f"Neptune Analytics client creation failed in region {region}: {str(e)}")
+        return
+
+    params = {}
+
+    # Special handling for resources that require graph IDs
+    if config.get('requires_graph', False):
+        # First get list of graphs
         try:
-            client = session.client('neptune-graph', region_name=region, config=client_config)
-        except Exception as e:
-            logger.warning(f"Neptune Analytics client creation failed in region {region}: {str(e)}")
-            return f'{service}:{service_type}', "success", "", []
-        
-        if not hasattr(client, config['method']):
-            logger.warning(f"Method {config['method']} not available for neptune-graph client")
-            return f'{service}:{service_type}', "success", "", []
-
-        method = getattr(client, config['method'])
-        params = {}
-        
-        # Special handling for resources that require graph IDs
-        if config.get('requires_graph', False):
-            # First get list of graphs
-            try:
-                graphs_response = client.list_graphs()
-                graph_ids = [graph['id'] for graph in graphs_response.get('graphs', [])]
-                if not graph_ids:
-                    logger.info(f"No graphs found for {service_type} discovery")
-                    return f'{service}:{service_type}', "success", "", []
-                
-                # Get resources for each graph
-                all_items = []
-                for graph_id in graph_ids:
-                    try:
-                        graph_params = {'graphIdentifier': graph_id}
-                        response = method(**graph_params)
-                        all_items.extend(response.get(config['key'], []))
-                    except Exception as graph_error:
-                        logger.warning(f"Error getting {service_type} for graph {graph_id}: {graph_error}")
-                        continue
-                        
-                page_iterator = [{config['key']: all_items}]
-                
-            except Exception as graph_error:
-                logger.warning(f"Error listing graphs for {service_type}: {graph_error}")
-                return f'{service}:{service_type}', "success", "", []
-        else:
-            # Handle Neptune Analytics API calls with proper error handling
-            try:
-                logger.info(f"Calling Neptune Analytics {config['method']} in region {region}")
-                
-                # Handle pagination
+            graph_ids = get_graph_ids(client, account_id, region)
+            if not graph_ids:
+                logger.info(f"No graphs found for {service_type} discovery")
+                return
+
+            # The operation wrapper is only needed when the list call can't be paginated
+            pageable = client.can_paginate(config['method'])
+            method = None if pageable else getattr(client, config['method'])
+
+            # Get resources for each graph concurrently
+            def get_graph_items(graph_id):
                 try:
-                    paginator = client.get_paginator(config['method'])
-                    page_iterator = paginator.paginate(**params)
-                except OperationNotPageableError:
-                    response = method(**params)
-                    page_iterator = [response]
-                    
-            except (ConnectTimeoutError, ReadTimeoutError) as e:
-                logger.warning(f"Neptune Analytics timeout in region {region}: {str(e)}")
-                return f'{service}:{service_type}', "success", "", []
-            except ClientError as e:
-                error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-                if error_code in ['UnauthorizedOperation', 'AccessDenied', 'InvalidAction']:
-                    logger.warning(f"Neptune Analytics not available in region {region}: {error_code}")
-                    return f'{service}:{service_type}', "success", "", []
-                else:
-                    logger.error(f"Neptune Analytics API error in region {region}: {str(e)}")
-                    return f'{service}:{service_type}', "error", str(e), []
-            except Exception as e:
-                logger.warning(f"Neptune Analytics general error in region {region}: {str(e)}")
-                return f'{service}:{service_type}', "success", "", []
+                    graph_params = {'graphIdentifier': graph_id}
+                    if pageable:
+                        items = []
+                        pages = client.get_paginator(config['method']).paginate(
+                            **graph_params, PaginationConfig={'PageSize': config['page_size']}
+                        )
+                        for page in pages:
+                            items.extend(page.get(config['key'], []))
+                        return items
+                    # list_queries is not pageable and requires maxResults
+                    response = method(**graph_params, maxResults=config['page_size'])
+                    return response.get(config['key'], [])
+                except ClientError as graph_error:
+                    # A vanished graph means the cached graph list is stale
+                    if graph_error.response.get('Error', {}).get('Code') == 'ResourceNotFoundException':
+                        invalidate_graph_ids(account_id, region)
+                    logger.warning(f"Error getting {service_type} for graph {graph_id}: {graph_error}")
+                    return []
+                except Exception as graph_error:
+                    logger.warning(f"Error getting {service_type} for graph {graph_id}: {graph_error}")
+                    return []
+
+            all_items = []
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(graph_ids))) as executor:
+                for graph_items in executor.map(get_graph_items, graph_ids):
+                    all_items.extend(graph_items)
+
+            page_iterator = [{config['key']: all_items}]
+
+        except Exception as graph_error:
+            logger.warning(f"Error listing graphs for {service_type}: {graph_error}")
+            return
+    else:
+        # Handle Neptune Analytics API calls with proper error handling
+        try:
+            logger.info(f"Calling Neptune Analytics {config['method']} in region {region}")
+
+            # Handle pagination
+            try:
+                paginator = client.get_paginator(config['method'])
+                page_iterator = paginator.paginate(**params, PaginationConfig={'PageSize': config['page_size']})
+            except OperationNotPageableError:
+                response = getattr(client, config['method'])(**params)
+                page_iterator = [response]
+
+        except (ConnectTimeoutError, ReadTimeoutError) as e:
+            logger.warning(f"Neptune Analytics timeout in region {region}: {str(e)}")
+            return
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+            if error_code in ['UnauthorizedOperation', 'AccessDenied', 'InvalidAction']:
+                logger.warning(f"Neptune Analytics not available in region {region}: {error_code}")
+                return
+            else:
+                logger.error(f"Neptune Analytics API error in region {region}: {str(e)}")
+                raise
+        except Exception as e:
+            logger.warning(f"Neptune Analytics general error in region {region}: {str(e)}")
+            return
+
+    # Tags for the whole region in one paginated call, per-resource lookup is the fallback
+    rgta_tags = {}
+    try:
+        rgta_tags = fetch_tags_via_rgta(session, region, config['rgta_filter'])
+    except Exception as rgta_error:
+        logger.warning(f"Could not retrieve Neptune Analytics tags via Resource Groups Tagging API: {rgta_error}")
+
+    # Field names and the ARN template are fixed for the call, read them once
+    items_key = config['key']
+    id_field = config['id_field']
+    name_field = config['name_field']
+    date_field = config['date_field']
+    arn_field = config['arn_field']
+
+    # Every ARN template ends with the resource id, so the rest is formatted once
+    arn_prefix = config['arn_format'].format(region=region, account_id=account_id, resource_id='')
+    metadata_fields = _METADATA_FIELDS.get(service_type, ())
+
+    list_tags = client.list_tags_for_resource
+
+    def fetch_tags(record):
+        try:
+            tags_response = list_tags(resourceArn=record['arn'])
+            # Neptune Analytics returns tags as a dictionary
+            return tags_response.get('tags', {})
+        except (ConnectTimeoutError, ReadTimeoutError):
+            logger.warning(f"Timeout retrieving tags for Neptune Analytics resource {record['name']}")
+            return {}
+        except Exception as tag_error:
+            logger.warning(f"Could not retrieve tags for {record['name']}: {tag_error}")
+            return {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
 
         # Process results
         for page in page_iterator:
-            items = page.get(config['key'], [])
+            items = page.get(items_key)
+            if not items:
+                continue
+
+            page_records = []
+
+            # Records of this page the tagging API returned no tags for, tagged before the page is yielded
+            needs_tags = []
 
             for item in items:
                 try:
-                    resource_id = item[config['id_field']]
-                    resource_name = item.get(config['name_field'], resource_id) if config['name_field'] else resource_id
+                    resource_id = item[id_field]
+                    resource_name = item.get(name_field, resource_id) if name_field else resource_id
 
                     # Get creation date
                     creation_date = None
-                    if config['date_field'] and config['date_field'] in item:
-                        creation_date = item[config['date_field']]
+                    if date_field and date_field in item:
+                        creation_date = item[date_field]
                         if hasattr(creation_date, 'isoformat'):
                             creation_date = creation_date.isoformat()
 
-                    # Build ARN
-                    arn = config['arn_format'].format(
-                        region=region,
-                        account_id=account_id,
-                        resource_id=resource_id
-                    )
-
-                    # Get existing tags
-                    resource_tags = {}
-                    try:
-                        tags_response = client.list_tags_for_resource(resourceArn=arn)
-                        tags_dict = tags_response.get('tags', {})
-                        # Neptune Analytics returns tags as a dictionary
-                        resource_tags = tags_dict
-                    except (ConnectTimeoutError, ReadTimeoutError):
-                        logger.warning(f"Timeout retrieving tags for Neptune Analytics resource {resource_name}")
-                        resource_tags = {}
-                    except Exception as tag_error:
-                        logger.warning(f"Could not retrieve tags for {resource_name}: {tag_error}")
-                        resource_tags = {}
+                    # Use the ARN from the response when the type has one, otherwise build it
+                    arn = item.get(arn_field) if arn_field else None
+                    if not arn:
+                        arn = arn_prefix + resource_id
+
+                    # Existing tags, resources the tagging API did not return are fetched concurrently below
+                    resource_tags = rgta_tags.get(arn) or {}
 
                     # Get additional metadata based on resource type
-                    additional_metadata = {}
-                    if service_type == 'Graph':
-                        additional_metadata = {
-                            'status': item.get('status', ''),
-                            'statusReason': item.get('statusReason', ''),
-                            'endpoint': item.get('endpoint', ''),
-                            'replicaCount': item.get('replicaCount', 0),
-                            'kmsKeyIdentifier': item.get('kmsKeyIdentifier', ''),
-                            'sourceSnapshotId': item.get('sourceSnapshotId', ''),
-                            'deletionProtection': item.get('deletionProtection', False),
-                            'buildNumber': item.get('buildNumber', ''),
-                            'provisionedMemory': item.get('provisionedMemory', 0)
-                        }
-                    elif service_type == 'GraphSnapshot':
-                        additional_metadata = {
-                            'sourceGraphId': item.get('sourceGraphId', ''),
-                            'status': item.get('status', ''),
-                            'kmsKeyIdentifier': item.get('kmsKeyIdentifier', ''),
-                            'snapshotType': item.get('snapshotType', ''),
-                            'statusReason': item.get('statusReason', '')
-                        }
-                    elif service_type == 'PrivateGraphEndpoint':
-                        additional_metadata = {
-                            'graphIdentifier': item.get('graphIdentifier', ''),
-                            'vpcId': item.get('vpcId', ''),
-                            'subnetIds': item.get('subnetIds', []),
-                            'status': item.get('status', ''),
-                            'vpcEndpointId': item.get('vpcEndpointId', '')
-                        }
-                    elif service_type == 'ImportTask':
-                        additional_metadata = {
-                            'graphId': item.get('graphId', ''),
-                            'source': item.get('source', ''),
-                            'format': item.get('format', ''),
-                            'status': item.get('status', ''),
-                            'roleArn': item.get('roleArn', ''),
-                            'importOptions': item.get('importOptions', {}),
-                            'importedGraphSummary': item.get('importedGraphSummary', {})
-                        }
-                    elif service_type == 'ExportTask':
-                        additional_metadata = {
-                            'graphId': item.get('graphId', ''),
-                            'destination': item.get('destination', ''),
-                            'format': item.get('format', ''),
-                            'status': item.get('status', ''),
-                            'roleArn': item.get('roleArn', ''),
-                            'exportTaskDetails': item.get('exportTaskDetails', {})
-                        }
-                    elif service_type == 'Query':
-                        additional_metadata = {
-                            'graphIdentifier': item.get('graphIdentifier', ''),
-                            'state': item.get('state', ''),
-                            'elapsed': item.get('elapsed', 0),
-                            'queryString': item.get('queryString', ''),
-                            'waited': item.get('waited', 0)
-                        }
-
-                    # Combine original item with additional metadata
-                    metadata = {**item, **additional_metadata}
-
-                    resources.append({
+                    # Missing fields get a copy of the default, so records never share the table's [] and {} objects
+                    additional_metadata = {
+                        field: item[field] if field in item else copy(default) for field, default in metadata_fields
+                    }
+
+                    # Combine original item with additional metadata, the item is a fresh response dict so it is extended in place
+                    item.update(additional_metadata)
+                    metadata = item
+
+                    record = {
                         "account_id": account_id,
                         "region": region,
                         "service": service,
@@ -294,11 +486,32 @@ def discovery(self, session, account_id, region, service, service_type, logger):
                         "tags_number": len(resource_tags),
                         "metadata": metadata,
                         "arn": arn
-                    })
+                    }
+                    page_records.append(record)
+                    if not resource_tags:
+                        needs_tags.append(record)
                 except Exception as item_error:
                     logger.warning(f"Error processing Neptune Analytics item: {str(item_error)}")
                     continue
 
+            # Fetch the missing tags concurrently
+            for record, resource_tags in zip(needs_tags, executor.map(fetch_tags, needs_tags)):
+                record["tags"] = resource_tags
+                record["tags_number"] = len(resource_tags)
+
+            yield from page_records
+
+
+def discovery(self, session, account_id, region, service, service_type, logger):    
+    
+    status = "success"
+    error_message = ""
+    resources = []
+
+    try:
+        for resource in discovery_iter(self, session, account_id, region, service, service_type, logger):
+            resources.append(resource)
+
         logger.info(f'Discovery completed for {service}:{service_type}. Found {len(resources)} {service_type.lower()}s')
 
     except Exception as e:
@@ -314,47 +527,45 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
     logger.info(f'Tagging # Account : {account_id}, Region : {region}, Service : {service}')
     
     results = []    
+
+    if tags_action not in (1, 2):
+        logger.error(f"Invalid tags action {tags_action} for {service} in {account_id}/{region}, expected 1 (add) or 2 (remove)")
+        return []
+
     tags = parse_tags(tags_string)
 
     if tags_action == 2:        
         tag_keys = list(tags.keys()) if isinstance(tags, dict) else [tag['Key'] for tag in tags]
 
-    # Create Neptune Analytics client with timeout protection
-    session = boto3.Session()
-    client_config = Config(
-        read_timeout=15,
-        connect_timeout=10,
-        retries={'max_attempts': 2, 'mode': 'standard'}
-    )
-    
-    try:
-        neptune_graph_client = session.client('neptune-graph', region_name=region, config=client_config)
-    except Exception as e:
-        logger.error(f"Failed to create Neptune Analytics client: {str(e)}")
-        return []
+    # Add tags - Neptune Analytics uses dictionary format, the payload is the same for every resource
+    if tags_action == 1:
+        if isinstance(tags, list):
+            neptune_graph_tags = {tag['Key']: tag['Value'] for tag in tags}
+        else:
+            neptune_graph_tags = tags
 
-    for resource in resources:            
+    # Use the client handed in by the tagger, otherwise create one with timeout protection
+    if client is not None:
+        neptune_graph_client = client
+    else:
         try:
-            if tags_action == 1:
-                # Add tags - Neptune Analytics uses dictionary format
-                if isinstance(tags, list):
-                    neptune_graph_tags = {tag['Key']: tag['Value'] for tag in tags}
-                else:
-                    neptune_graph_tags = tags
-                    
-                neptune_graph_client.tag_resource(
-                    resourceArn=resource.arn,
-                    tags=neptune_graph_tags
-                )
-                        
-            elif tags_action == 2:
-                # Remove tags
-                neptune_graph_client.untag_resource(
-                    resourceArn=resource.arn,
-                    tagKeys=tag_keys
-                )
+            neptune_graph_client = get_neptune_graph_client(get_default_session(), region)
+        except Exception as e:
+            logger.error(f"Failed to create Neptune Analytics client: {str(e)}")
+            return []
+
+    # Bind the operation and its payload once, each resource only adds its ARN
+    if tags_action == 1:
+        tag_operation = partial(neptune_graph_client.tag_resource, tags=neptune_graph_tags)
+    else:
+        # Remove tags
+        tag_operation = partial(neptune_graph_client.untag_resource, tagKeys=tag_keys)
+
+    def tag_single_resource(resource):
+        try:
+            tag_operation(resourceArn=resource.arn)
                     
-            results.append({
+            return {
                 'account_id': account_id,
                 'region': region,
                 'service': service,
@@ -362,12 +573,12 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
                 'arn': resource.arn,
                 'status': 'success',
                 'error': ""
-            })
+            }
             
         except Exception as e:
             logger.error(f"Error processing {service} resource {resource.identifier}: {str(e)}")
             
-            results.append({
+            return {
                 'account_id': account_id,
                 'region': region,
                 'service': service,
@@ -375,17 +586,29 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
                 'arn': resource.arn,
                 'status': 'error',
                 'error': str(e)
-            })    
+            }
+
+    # Tag resources concurrently, results keep the order of the input resources
+    if resources:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(resources))) as executor:
+            results.extend(executor.map(tag_single_resource, resources))
     
     return results
 
 
+@lru_cache(maxsize=128)
+def _parse_tags_cached(tags_string):
+    """Parse tags once per distinct string, as immutable (key, value) pairs"""
+    if not tags_string:
+        return ()
+    return tuple({
+        key.strip(): value.strip()
+        for key, separator, value in (tag_pair.partition(':') for tag_pair in tags_string.split(','))
+        if separator
+    }.items())
+
+
 def parse_tags(tags_string):
     """Parse tags from string format to dictionary"""
-    tags = {}
-    if tags_string:
-        for tag_pair in tags_string.split(','):
-            if ':' in tag_pair:
-                key, value = tag_pair.split(':', 1)
-                tags[key.strip()] = value.strip()
-    return tags
+    # A fresh dict per call, so callers can change it without touching the cached pairs
+    return dict(_parse_tags_cached(tags_string))
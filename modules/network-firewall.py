@@ -1,7 +1,127 @@
 import json
 import boto3
+import botocore.session
+from botocore import xform_name
+import threading
+import weakref
+import concurrent.futures
+from functools import lru_cache
 from typing import List, Dict, Tuple
 from botocore.exceptions import OperationNotPageableError
+from botocore.config import Config
+
+
+# Concurrent list/tag calls per discovery or tagging batch
+MAX_WORKERS = 16
+
+# Default session for tagging, created on first use (it reads credentials and config files)
+_DEFAULT_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+# Network Firewall clients per session and region, entries go away with their session
+_CLIENT_CACHE = weakref.WeakKeyDictionary()
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+# Static resource definitions, built once at import time and treated as read-only
+_RESOURCE_CONFIGS = {
+    'Firewall': {
+        'method': 'list_firewalls',
+        'key': 'Firewalls',
+        'id_field': 'FirewallArn',
+        'name_field': 'FirewallName',
+        'date_field': None,  # Not available in list response
+        'nested': False,
+        'page_size': 100,  # Service maximum for MaxResults
+        'arn_format': None  # ARN is provided directly
+    },
+    'FirewallPolicy': {
+        'method': 'list_firewall_policies',
+        'key': 'FirewallPolicies',
+        'id_field': 'Arn',
+        'name_field': 'Name',
+        'date_field': None,  # Not available in list response
+        'nested': False,
+        'page_size': 100,  # Service maximum for MaxResults
+        'arn_format': None  # ARN is provided directly
+    },
+    'RuleGroup': {
+        'method': 'list_rule_groups',
+        'key': 'RuleGroups',
+        'id_field': 'Arn',
+        'name_field': 'Name',
+        'date_field': None,  # Not available in list response
+        'nested': False,
+        'page_size': 100,  # Service maximum for MaxResults
+        'arn_format': None  # ARN is provided directly
+    },
+    'TLSInspectionConfiguration': {
+        'method': 'list_tls_inspection_configurations',
+        'key': 'TLSInspectionConfigurations',
+        'id_field': 'Arn',
+        'name_field': 'Name',
+        'date_field': None,  # Not available in list response
+        'nested': False,
+        'page_size': 100,  # Service maximum for MaxResults
+        'arn_format': None  # ARN is provided directly
+    }
+}
+
+
+# Shared client configuration, keep-alive and a large enough pool let concurrent calls reuse warm connections.
+# All service types of a session and region share one client and may be discovered at the same time,
+# each with its list call plus MAX_WORKERS tag lookups in flight
+CLIENT_CONFIG = Config(
+    read_timeout=15,
+    connect_timeout=10,
+    tcp_keepalive=True,
+    max_pool_connections=(MAX_WORKERS + 1) * len(_RESOURCE_CONFIGS),
+    retries={'max_attempts': 2, 'mode': 'standard'}
+)
+
+
+def _meta_firewall(item):
+    return {
+        'FirewallId': item.get('FirewallId', ''),
+        'VpcId': item.get('VpcId', ''),
+        'SubnetMappings': item.get('SubnetMappings', []),
+        'FirewallPolicyArn': item.get('FirewallPolicyArn', ''),
+        'DeleteProtection': item.get('DeleteProtection', False),
+        'SubnetChangeProtection': item.get('SubnetChangeProtection', False),
+        'FirewallPolicyChangeProtection': item.get('FirewallPolicyChangeProtection', False)
+    }
+
+
+def _meta_firewall_policy(item):
+    return {
+        'Description': item.get('Description', ''),
+        'Type': item.get('Type', '')
+    }
+
+
+def _meta_rule_group(item):
+    return {
+        'Type': item.get('Type', ''),  # STATELESS or STATEFUL
+        'Capacity': item.get('Capacity', ''),
+        'Description': item.get('Description', '')
+    }
+
+
+def _meta_tls_inspection_configuration(item):
+    last_modified = item.get('LastModifiedTime', '')
+    return {
+        'Description': item.get('Description', ''),
+        'LastModifiedTime': last_modified.isoformat() if hasattr(last_modified, 'isoformat') else last_modified
+    }
+
+
+# Additional metadata extractor per resource type, picked once per discovery
+_META_EXTRACTORS = {
+    'Firewall': _meta_firewall,
+    'FirewallPolicy': _meta_firewall_policy,
+    'RuleGroup': _meta_rule_group,
+    'TLSInspectionConfiguration': _meta_tls_inspection_configuration
+}
+
 
 def get_service_types(account_id, region, service, service_type):
     """
@@ -17,84 +137,94 @@ def get_service_types(account_id, region, service, service_type):
     Note: Network Firewall is a regional service for VPC-level network protection
     """
 
-    resource_configs = {
-        'Firewall': {
-            'method': 'list_firewalls',
-            'key': 'Firewalls',
-            'id_field': 'FirewallArn',
-            'name_field': 'FirewallName',
-            'date_field': None,  # Not available in list response
-            'nested': False,
-            'arn_format': None  # ARN is provided directly
-        },
-        'FirewallPolicy': {
-            'method': 'list_firewall_policies',
-            'key': 'FirewallPolicies',
-            'id_field': 'Arn',
-            'name_field': 'Name',
-            'date_field': None,  # Not available in list response
-            'nested': False,
-            'arn_format': None  # ARN is provided directly
-        },
-        'RuleGroup': {
-            'method': 'list_rule_groups',
-            'key': 'RuleGroups',
-            'id_field': 'Arn',
-            'name_field': 'Name',
-            'date_field': None,  # Not available in list response
-            'nested': False,
-            'arn_format': None  # ARN is provided directly
-        },
-        'TLSInspectionConfiguration': {
-            'method': 'list_tls_inspection_configurations',
-            'key': 'TLSInspectionConfigurations',
-            'id_field': 'Arn',
-            'name_field': 'Name',
-            'date_field': None,  # Not available in list response
-            'nested': False,
-            'arn_format': None  # ARN is provided directly
-        }
-    }
-    
-    return resource_configs
+    return _RESOURCE_CONFIGS
 
 
-def discovery(self, session, account_id, region, service, service_type, logger):    
-    
-    status = "success"
-    error_message = ""
-    resources = []
+@lru_cache(maxsize=None)
+def unsupported_methods():
+    """
+    Configured list methods that are not network-firewall operations in the installed botocore, checked once per process
+    """
+    service_model = botocore.session.get_session().get_service_model('network-firewall')
+    methods = {xform_name(operation) for operation in service_model.operation_names}
+    return frozenset(config['method'] for config in _RESOURCE_CONFIGS.values()) - methods
+
+
+def get_default_session():
+    global _DEFAULT_SESSION
+    with _SESSION_LOCK:
+        if _DEFAULT_SESSION is None:
+            _DEFAULT_SESSION = boto3.Session()
+        return _DEFAULT_SESSION
 
+
+def get_network_firewall_client(session, region):
+    """
+    Network Firewall client for a session and region, created once and reused (clients are thread-safe, sessions are not)
+    """
+    with _CLIENT_CACHE_LOCK:
+        session_clients = _CLIENT_CACHE.setdefault(session, {})
+        if region not in session_clients:
+            session_clients[region] = session.client('network-firewall', region_name=region, config=CLIENT_CONFIG)
+        return session_clients[region]
+
+
+def discovery_iter(self, session, account_id, region, service, service_type, logger):
+    """
+    Yield discovered resources page by page, errors that should fail the scan are raised
+    """
+
+    if service_type not in _RESOURCE_CONFIGS:
+        raise ValueError(f"Unsupported service type: {service_type}")
+
+    config = _RESOURCE_CONFIGS[service_type]
+    extract_metadata = _META_EXTRACTORS[service_type]
+
+    # Checked against the service model once per process, before any client is built
+    if config['method'] in unsupported_methods():
+        raise ValueError(f"Method {config['method']} not available for network-firewall client")
+
+    # Network Firewall is regional
+    client = get_network_firewall_client(session, region)
+
+    method = getattr(client, config['method'])
+    params = {}
+
+    # Handle pagination
     try:
-        
-        service_types_list = get_service_types(account_id, region, service, service_type)        
-        if service_type not in service_types_list:
-            raise ValueError(f"Unsupported service type: {service_type}")
-
-        config = service_types_list[service_type]
-        
-        # Network Firewall is regional
-        client = session.client('network-firewall', region_name=region)
-        
-        if not hasattr(client, config['method']):
-            raise ValueError(f"Method {config['method']} not available for network-firewall client")
-
-        method = getattr(client, config['method'])
-        params = {}
-
-        # Handle pagination
+        paginator = client.get_paginator(config['method'])
+        page_iterator = paginator.paginate(**params, PaginationConfig={'PageSize': config['page_size']})
+    except OperationNotPageableError:
+        response = method(**params, MaxResults=config['page_size'])
+        page_iterator = [response]
+
+    def fetch_tags(arn, resource_name):
         try:
-            paginator = client.get_paginator(config['method'])
-            page_iterator = paginator.paginate(**params)
-        except OperationNotPageableError:
-            response = method(**params)
-            page_iterator = [response]
+            tags_response = client.list_tags_for_resource(ResourceArn=arn)
+            tags_list = tags_response.get('Tags', [])
+            # Convert Network Firewall tag format to standard format
+            return {tag.get('Key', ''): tag.get('Value', '') for tag in tags_list}
+        except Exception as tag_error:
+            logger.warning(f"Could not retrieve tags for {resource_name}: {tag_error}")
+            return {}
+
+    def complete_page(page_records):
+        for record, future in page_records:
+            resource_tags = future.result()
+            record['tags'] = resource_tags
+            record['tags_number'] = len(resource_tags)
+            yield record
 
+    # List APIs never return tags, so each page's tag lookups are submitted right away and the page
+    # is yielded once the next one is listed, as (record, future) pairs
+    pending_page = []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         # Process each page of results
         for page in page_iterator:
-            items = page[config['key']]
+            page_records = []
 
-            for item in items:
+            for item in page[config['key']]:
                 resource_id = item[config['id_field']]
                 resource_name = item.get(config['name_field'], resource_id) if config['name_field'] else resource_id
 
@@ -105,49 +235,16 @@ def discovery(self, session, account_id, region, service, service_type, logger):
                 arn = resource_id
 
                 # Get additional metadata based on resource type
-                additional_metadata = {}
-                if service_type == 'Firewall':
-                    additional_metadata = {
-                        'FirewallId': item.get('FirewallId', ''),
-                        'VpcId': item.get('VpcId', ''),
-                        'SubnetMappings': item.get('SubnetMappings', []),
-                        'FirewallPolicyArn': item.get('FirewallPolicyArn', ''),
-                        'DeleteProtection': item.get('DeleteProtection', False),
-                        'SubnetChangeProtection': item.get('SubnetChangeProtection', False),
-                        'FirewallPolicyChangeProtection': item.get('FirewallPolicyChangeProtection', False)
-                    }
-                elif service_type == 'FirewallPolicy':
-                    additional_metadata = {
-                        'Description': item.get('Description', ''),
-                        'Type': item.get('Type', '')
-                    }
-                elif service_type == 'RuleGroup':
-                    additional_metadata = {
-                        'Type': item.get('Type', ''),  # STATELESS or STATEFUL
-                        'Capacity': item.get('Capacity', ''),
-                        'Description': item.get('Description', '')
-                    }
-                elif service_type == 'TLSInspectionConfiguration':
-                    additional_metadata = {
-                        'Description': item.get('Description', ''),
-                        'LastModifiedTime': item.get('LastModifiedTime', '').isoformat() if hasattr(item.get('LastModifiedTime', ''), 'isoformat') else item.get('LastModifiedTime', '')
-                    }
-
-                # Get existing tags
+                additional_metadata = extract_metadata(item)
+
+                # Existing tags are filled in from the page's tag lookups
                 resource_tags = {}
-                try:
-                    tags_response = client.list_tags_for_resource(ResourceArn=arn)
-                    tags_list = tags_response.get('Tags', [])
-                    # Convert Network Firewall tag format to standard format
-                    resource_tags = {tag.get('Key', ''): tag.get('Value', '') for tag in tags_list}
-                except Exception as tag_error:
-                    logger.warning(f"Could not retrieve tags for {resource_name}: {tag_error}")
-                    resource_tags = {}
-
-                # Combine original item with additional metadata
-                metadata = {**item, **additional_metadata}
-
-                resources.append({
+
+                # Extend the original item with the additional metadata, it is not used again
+                item.update(additional_metadata)
+                metadata = item
+
+                record = {
                     "account_id": account_id,
                     "region": region,
                     "service": service,
@@ -159,7 +256,24 @@ def discovery(self, session, account_id, region, service, service_type, logger):
                     "tags_number": len(resource_tags),
                     "metadata": metadata,
                     "arn": arn
-                })
+                }
+                page_records.append((record, executor.submit(fetch_tags, arn, resource_name)))
+
+            yield from complete_page(pending_page)
+            pending_page = page_records
+
+        yield from complete_page(pending_page)
+
+
+def discovery(self, session, account_id, region, service, service_type, logger):    
+    
+    status = "success"
+    error_message = ""
+    resources = []
+
+    try:
+        for resource in discovery_iter(self, session, account_id, region, service, service_type, logger):
+            resources.append(resource)
 
         logger.info(f'Discovery completed for {service}:{service_type}. Found {len(resources)} {service_type.lower()}s')
 
@@ -177,33 +291,40 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
     logger.info(f'Tagging # Account : {account_id}, Region : {region}, Service : {service}')
     
     results = []    
+
+    if tags_action not in (1, 2):
+        logger.error(f"Invalid tags action {tags_action} for {service} in {account_id}/{region}, expected 1 (add) or 2 (remove)")
+        return []
+
     tags = parse_tags(tags_string)
 
     if tags_action == 2:        
         tag_keys = [item['Key'] for item in tags]
 
-    # Create Network Firewall client
-    session = boto3.Session()
-    network_firewall_client = session.client('network-firewall', region_name=region)
+    # Use the client handed in by the tagger (it carries the target account's role), otherwise the cached default one,
+    # shared by the tagging workers (clients are thread-safe)
+    if client is not None:
+        network_firewall_client = client
+    else:
+        network_firewall_client = get_network_firewall_client(get_default_session(), region)
 
-    for resource in resources:            
+    def tag_single_resource(resource):
         try:
             if tags_action == 1:
-                # Add tags - Convert to Network Firewall format (list of objects)
-                network_firewall_tags = [{'Key': tag['Key'], 'Value': tag['Value']} for tag in tags]
                 network_firewall_client.tag_resource(
                     ResourceArn=resource.arn,
-                    Tags=network_firewall_tags
+                    Tags=tags  # Already in Network Firewall format (list of objects)
                 )
                         
-            elif tags_action == 2:
+            else:
                 # Remove tags
                 network_firewall_client.untag_resource(
                     ResourceArn=resource.arn,
                     TagKeys=tag_keys
                 )
+
                     
-            results.append({
+            return {
                 'account_id': account_id,
                 'region': region,
                 'service': service,
@@ -211,12 +332,12 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
                 'arn': resource.arn,
                 'status': 'success',
                 'error': ""
-            })
+            }
             
         except Exception as e:
             logger.error(f"Error processing {service} resource {resource.identifier}: {str(e)}")
             
-            results.append({
+            return {
                 'account_id': account_id,
                 'region': region,
                 'service': service,
@@ -224,17 +345,23 @@ def tagging(account_id, region, service, client, resources, tags_string, tags_ac
                 'arn': resource.arn,
                 'status': 'error',
                 'error': str(e)
-            })    
+            }
+
+    # Tag resources concurrently, results keep the order of the input resources
+    if resources:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(resources))) as executor:
+            results.extend(executor.map(tag_single_resource, resources))
     
     return results
 
 
 def parse_tags(tags_string):
     """Parse tags from string format to list of dictionaries"""
-    tags = []
-    if tags_string:
-        for tag_pair in tags_string.split(','):
-            if ':' in tag_pair:
-                key, value = tag_pair.split(':', 1)
-                tags.append({'Key': key.strip(), 'Value': value.strip()})
-    return tags
+    if not tags_string:
+        return []
+    # A single partition per pair, values may contain ':'
+    return [
+        {'Key': key.strip(), 'Value': value.strip()}
+        for key, separator, value in (tag_pair.partition(':') for tag_pair in tags_string.split(','))
+        if separator
+    ]